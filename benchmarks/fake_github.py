@@ -0,0 +1,519 @@
+"""In-memory stand-in for the GitHub REST API used by the benchmarks
+
+Emulates the endpoints GitHubSync relies on (user, repos, contents, git
+data, archives, GraphQL blob lookups) closely enough for PyGithub, with
+configurable per-request latency and rate limits. Counts requests and
+bytes in both directions so a run can report what an operation cost.
+"""
+import base64
+import hashlib
+import io
+import json
+import re
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+
+def blob_sha(data):
+    return hashlib.sha1(f"blob {len(data)}\0".encode() + data).hexdigest()
+
+
+class FakeRepo:
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.blobs = {}
+        self.trees = {}
+        self.commits = {}
+        self.refs = {}
+
+    @property
+    def full_name(self):
+        return f"{self.owner}/{self.name}"
+
+    def put_blob(self, data):
+        sha = blob_sha(data)
+        self.blobs[sha] = data
+        return sha
+
+    def put_tree(self, files):
+        sha = hashlib.sha1(json.dumps(sorted(files.items())).encode()).hexdigest()
+        self.trees[sha] = dict(files)
+        return sha
+
+    def put_commit(self, tree_sha, parents, message):
+        payload = json.dumps([tree_sha, parents, message, time.time()]).encode()
+        sha = hashlib.sha1(payload).hexdigest()
+        self.commits[sha] = {"tree": tree_sha, "parents": parents, "message": message}
+        return sha
+
+    def head_files(self, ref="main"):
+        head = self.refs.get(f"refs/heads/{ref}")
+        if head is None:
+            return None
+        return self.trees[self.commits[head]["tree"]]
+
+    def commit_files(self, changes, message, ref="main"):
+        """Apply {path: bytes | None} on top of the branch head"""
+        head = self.refs.get(f"refs/heads/{ref}")
+        files = dict(self.trees[self.commits[head]["tree"]]) if head else {}
+        for path, data in changes.items():
+            if data is None:
+                files.pop(path, None)
+            else:
+                files[path] = self.put_blob(data)
+        tree_sha = self.put_tree(files)
+        commit_sha = self.put_commit(tree_sha, [head] if head else [], message)
+        self.refs[f"refs/heads/{ref}"] = commit_sha
+        return commit_sha
+
+
+class FakeGitHub:
+    """Server state shared between request handler threads"""
+
+    def __init__(self, login="student", latency=0.0, rate_limit=5000, rate_reset=3600):
+        self.login = login
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_remaining = rate_limit
+        self.rate_reset = rate_reset
+        self.reset_at = time.time() + rate_reset
+        self.repos = {}
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.server = None
+        self.thread = None
+
+    def set_rate_limit(self, remaining, reset_in):
+        with self.lock:
+            self.rate_remaining = remaining
+            self.reset_at = time.time() + reset_in
+
+    def reset_counters(self):
+        with self.lock:
+            self.request_count = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def create_repo(self, owner, name, files=None):
+        repo = FakeRepo(owner, name)
+        repo.commit_files(
+            {path: (data.encode() if isinstance(data, str) else data) for path, data in (files or {"README.md": "# repo\n"}).items()},
+            "Initial commit",
+        )
+        self.repos[repo.full_name] = repo
+        return repo
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self, host="127.0.0.1", port=0):
+        state = self
+
+        class Handler(FakeGitHubHandler):
+            fake = state
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    fake = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # -- plumbing -------------------------------------------------------
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length)
+        elif self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            body = b"".join(chunks)
+        else:
+            body = b""
+        with self.fake.lock:
+            self.fake.bytes_received += len(body)
+        return json.loads(body) if body else {}
+
+    def _send(self, status, payload=None, headers=None, raw=None, content_type="application/json"):
+        body = raw if raw is not None else (json.dumps(payload).encode() if payload is not None else b"")
+        etag = None
+        if self.command == "GET" and status == 200:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        fake = self.fake
+        self.send_header("X-RateLimit-Limit", str(fake.rate_limit))
+        self.send_header("X-RateLimit-Remaining", str(fake.rate_remaining))
+        self.send_header("X-RateLimit-Reset", str(int(fake.reset_at)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        with fake.lock:
+            fake.bytes_sent += len(body)
+
+    def _error(self, status, message):
+        self._send(status, {"message": message, "documentation_url": "https://docs.github.com"})
+
+    def _handle(self):
+        fake = self.fake
+        if fake.latency:
+            time.sleep(fake.latency)
+        with fake.lock:
+            fake.request_count += 1
+            if time.time() >= fake.reset_at:
+                fake.rate_remaining = fake.rate_limit
+                fake.reset_at = time.time() + fake.rate_reset
+            limited = fake.rate_remaining <= 0
+            if not limited and not (self.command == "GET" and self.headers.get("If-None-Match")):
+                fake.rate_remaining -= 1
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        body = self._read_body() if self.command in ("POST", "PUT", "PATCH", "DELETE") else {}
+        if limited:
+            self._send(403, {"message": "API rate limit exceeded for user."})
+            return
+        for method, pattern, handler in ROUTES:
+            if method != self.command:
+                continue
+            match = re.fullmatch(pattern, path)
+            if match:
+                try:
+                    handler(self, query, body, *match.groups())
+                except KeyError as e:
+                    self._error(404, f"Not Found: {e}")
+                return
+        self._error(404, "Not Found")
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    # -- helpers --------------------------------------------------------
+
+    def _url(self, suffix):
+        return f"{self.fake.base_url}{suffix}"
+
+    def _repo(self, owner, name):
+        return self.fake.repos[f"{owner}/{name}"]
+
+    def _repo_json(self, repo):
+        return {
+            "id": abs(hash(repo.full_name)) % 10**8,
+            "name": repo.name,
+            "full_name": repo.full_name,
+            "owner": {"login": repo.owner},
+            "default_branch": "main",
+            "private": False,
+            "html_url": f"https://github.com/{repo.full_name}",
+            "url": self._url(f"/repos/{repo.full_name}"),
+        }
+
+    # -- endpoints ------------------------------------------------------
+
+    def get_user(self, query, body):
+        self._send(200, {"login": self.fake.login, "url": self._url("/user")})
+
+    def get_rate_limit(self, query, body):
+        core = {"limit": self.fake.rate_limit, "remaining": self.fake.rate_remaining,
+                "reset": int(self.fake.reset_at), "used": 0}
+        self._send(200, {"resources": {"core": core}, "rate": core})
+
+    def create_repo(self, query, body):
+        name = body["name"]
+        full_name = f"{self.fake.login}/{name}"
+        if full_name in self.fake.repos:
+            self._error(422, "Repository creation failed")
+            return
+        with self.fake.lock:
+            repo = FakeRepo(self.fake.login, name)
+            if body.get("auto_init"):
+                repo.commit_files({"README.md": b"# " + name.encode() + b"\n"}, "Initial commit")
+            self.fake.repos[full_name] = repo
+        self._send(201, self._repo_json(repo))
+
+    def get_repo(self, query, body, owner, name):
+        self._send(200, self._repo_json(self._repo(owner, name)))
+
+    def get_contents(self, query, body, owner, name, path):
+        repo = self._repo(owner, name)
+        files = repo.head_files() or {}
+        path = path.strip("/")
+        if path in files:
+            data = repo.blobs[files[path]]
+            self._send(200, self._content_json(repo, path, files[path], data))
+            return
+        prefix = f"{path}/" if path else ""
+        entries = {}
+        for file_path, sha in files.items():
+            if not file_path.startswith(prefix):
+                continue
+            rest = file_path[len(prefix):]
+            head, _, tail = rest.partition("/")
+            if tail:
+                entries.setdefault(head, {"type": "dir", "sha": hashlib.sha1(head.encode()).hexdigest(), "size": 0})
+            else:
+                entries[head] = {"type": "file", "sha": sha, "size": len(repo.blobs[sha])}
+        if not entries:
+            self._error(404, "Not Found")
+            return
+        listing = []
+        for entry_name, entry in sorted(entries.items()):
+            entry_path = f"{prefix}{entry_name}"
+            listing.append({
+                "name": entry_name, "path": entry_path, "type": entry["type"],
+                "sha": entry["sha"], "size": entry["size"],
+                "url": self._url(f"/repos/{repo.full_name}/contents/{entry_path}"),
+            })
+        self._send(200, listing)
+
+    def _content_json(self, repo, path, sha, data):
+        return {
+            "type": "file", "encoding": "base64", "size": len(data),
+            "name": path.rsplit("/", 1)[-1], "path": path, "sha": sha,
+            "content": base64.b64encode(data).decode(),
+            "url": self._url(f"/repos/{repo.full_name}/contents/{path}"),
+        }
+
+    def put_contents(self, query, body, owner, name, path):
+        repo = self._repo(owner, name)
+        with self.fake.lock:
+            files = repo.head_files() or {}
+            if path in files and body.get("sha") != files[path]:
+                self._error(409 if body.get("sha") else 422, "sha mismatch" if body.get("sha") else "\"sha\" wasn't supplied.")
+                return
+            data = base64.b64decode(body["content"])
+            commit = repo.commit_files({path: data}, body.get("message", ""))
+        status = 200 if path in files else 201
+        self._send(status, {
+            "content": self._content_json(repo, path, blob_sha(data), data),
+            "commit": {"sha": commit, "url": self._url(f"/repos/{repo.full_name}/git/commits/{commit}")},
+        })
+
+    def delete_contents(self, query, body, owner, name, path):
+        repo = self._repo(owner, name)
+        with self.fake.lock:
+            files = repo.head_files() or {}
+            if files.get(path) != body.get("sha"):
+                self._error(409, "sha mismatch")
+                return
+            commit = repo.commit_files({path: None}, body.get("message", ""))
+        self._send(200, {"content": None, "commit": {"sha": commit}})
+
+    def get_tree(self, query, body, owner, name, ref):
+        repo = self._repo(owner, name)
+        tree_sha = ref
+        if ref in repo.commits:
+            tree_sha = repo.commits[ref]["tree"]
+        elif f"refs/heads/{ref}" in repo.refs:
+            tree_sha = repo.commits[repo.refs[f"refs/heads/{ref}"]]["tree"]
+        elif not repo.refs:
+            self._error(409, "Git Repository is empty.")
+            return
+        files = repo.trees[tree_sha]
+        recursive = query.get("recursive") not in (None, "0", "false")
+        elements = []
+        dirs = set()
+        for path, sha in sorted(files.items()):
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                dirs.add("/".join(parts[:depth]))
+            if recursive or len(parts) == 1:
+                elements.append({"path": path, "mode": "100644", "type": "blob", "sha": sha,
+                                 "size": len(repo.blobs[sha]),
+                                 "url": self._url(f"/repos/{repo.full_name}/git/blobs/{sha}")})
+        for directory in sorted(dirs):
+            if recursive or "/" not in directory:
+                sub = {p[len(directory) + 1:]: s for p, s in files.items() if p.startswith(directory + "/")}
+                sub_sha = repo.put_tree(sub)
+                elements.append({"path": directory, "mode": "040000", "type": "tree", "sha": sub_sha,
+                                 "url": self._url(f"/repos/{repo.full_name}/git/trees/{sub_sha}")})
+        self._send(200, {"sha": tree_sha, "tree": elements, "truncated": False,
+                         "url": self._url(f"/repos/{repo.full_name}/git/trees/{tree_sha}")})
+
+    def get_blob(self, query, body, owner, name, sha):
+        repo = self._repo(owner, name)
+        data = repo.blobs[sha]
+        self._send(200, {"sha": sha, "size": len(data), "encoding": "base64",
+                         "content": base64.b64encode(data).decode(),
+                         "url": self._url(f"/repos/{repo.full_name}/git/blobs/{sha}")})
+
+    def create_blob(self, query, body, owner, name):
+        repo = self._repo(owner, name)
+        if not repo.refs:
+            self._error(409, "Git Repository is empty.")
+            return
+        content = body["content"]
+        data = base64.b64decode(content) if body.get("encoding") == "base64" else content.encode()
+        with self.fake.lock:
+            sha = repo.put_blob(data)
+        self._send(201, {"sha": sha, "url": self._url(f"/repos/{repo.full_name}/git/blobs/{sha}")})
+
+    def create_tree(self, query, body, owner, name):
+        repo = self._repo(owner, name)
+        if not repo.refs:
+            self._error(409, "Git Repository is empty.")
+            return
+        with self.fake.lock:
+            files = dict(repo.trees[body["base_tree"]]) if body.get("base_tree") else {}
+            for element in body["tree"]:
+                if "content" in element:
+                    files[element["path"]] = repo.put_blob(element["content"].encode())
+                elif element.get("sha") is None:
+                    files.pop(element["path"], None)
+                else:
+                    files[element["path"]] = element["sha"]
+            tree_sha = repo.put_tree(files)
+        self._send(201, {"sha": tree_sha, "tree": [], "truncated": False,
+                         "url": self._url(f"/repos/{repo.full_name}/git/trees/{tree_sha}")})
+
+    def _commit_json(self, repo, sha):
+        commit = repo.commits[sha]
+        return {"sha": sha, "message": commit["message"],
+                "tree": {"sha": commit["tree"], "url": self._url(f"/repos/{repo.full_name}/git/trees/{commit['tree']}")},
+                "parents": [{"sha": p, "url": self._url(f"/repos/{repo.full_name}/git/commits/{p}")} for p in commit["parents"]],
+                "url": self._url(f"/repos/{repo.full_name}/git/commits/{sha}")}
+
+    def get_commit(self, query, body, owner, name, sha):
+        repo = self._repo(owner, name)
+        self._send(200, self._commit_json(repo, sha))
+
+    def create_commit(self, query, body, owner, name):
+        repo = self._repo(owner, name)
+        with self.fake.lock:
+            sha = repo.put_commit(body["tree"], body.get("parents", []), body.get("message", ""))
+        self._send(201, self._commit_json(repo, sha))
+
+    def _ref_json(self, repo, ref):
+        sha = repo.refs[ref]
+        return {"ref": ref, "url": self._url(f"/repos/{repo.full_name}/git/{ref}"),
+                "object": {"sha": sha, "type": "commit",
+                           "url": self._url(f"/repos/{repo.full_name}/git/commits/{sha}")}}
+
+    def get_ref(self, query, body, owner, name, ref):
+        repo = self._repo(owner, name)
+        ref = f"refs/{ref}"
+        if ref not in repo.refs:
+            self._error(409 if not repo.refs else 404, "Git Repository is empty." if not repo.refs else "Not Found")
+            return
+        self._send(200, self._ref_json(repo, ref))
+
+    def update_ref(self, query, body, owner, name, ref):
+        repo = self._repo(owner, name)
+        ref = f"refs/{ref}"
+        with self.fake.lock:
+            head = repo.refs.get(ref)
+            if head and not body.get("force") and head not in self._ancestors(repo, body["sha"]):
+                self._error(422, "Update is not a fast forward")
+                return
+            repo.refs[ref] = body["sha"]
+        self._send(200, self._ref_json(repo, ref))
+
+    def _ancestors(self, repo, sha):
+        seen, stack = set(), [sha]
+        while stack:
+            current = stack.pop()
+            if current in seen or current not in repo.commits:
+                continue
+            seen.add(current)
+            stack.extend(repo.commits[current]["parents"])
+        return seen
+
+    def create_ref(self, query, body, owner, name):
+        repo = self._repo(owner, name)
+        with self.fake.lock:
+            repo.refs[body["ref"]] = body["sha"]
+        self._send(201, self._ref_json(repo, body["ref"]))
+
+    def get_archive(self, query, body, owner, name, fmt, ref):
+        self._send(302, None, headers={"Location": self._url(f"/_archive/{owner}/{name}/{ref}.tar.gz")})
+
+    def get_archive_data(self, query, body, owner, name, ref):
+        repo = self._repo(owner, name)
+        files = repo.head_files(ref) or {}
+        buffer = io.BytesIO()
+        root = f"{owner}-{name}-{repo.refs[f'refs/heads/{ref}'][:7]}"
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path, sha in sorted(files.items()):
+                data = repo.blobs[sha]
+                info = tarfile.TarInfo(f"{root}/{path}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        self._send(200, raw=buffer.getvalue(), content_type="application/x-gzip")
+
+    def graphql(self, query, body):
+        text = body.get("query", "")
+        match = re.search(r'repository\(owner:\s*"([^"]+)",\s*name:\s*"([^"]+)"\)', text)
+        repo = self._repo(*match.groups())
+        data = {}
+        for alias, expression in re.findall(r'(\w+):\s*object\(expression:\s*("(?:[^"\\]|\\.)*")\)', text):
+            ref, _, path = json.loads(expression).partition(":")
+            files = repo.head_files(ref) or {}
+            sha = files.get(path)
+            if sha is None:
+                data[alias] = None
+                continue
+            raw = repo.blobs[sha]
+            try:
+                decoded = raw.decode("utf-8")
+                binary = False
+            except UnicodeDecodeError:
+                decoded, binary = None, True
+            data[alias] = {"oid": sha, "byteSize": len(raw), "isBinary": binary, "isTruncated": False, "text": decoded}
+        self._send(200, {"data": {"repository": data}})
+
+
+R = r"/repos/([^/]+)/([^/]+)"
+ROUTES = [
+    ("GET", r"/user", FakeGitHubHandler.get_user),
+    ("GET", r"/rate_limit", FakeGitHubHandler.get_rate_limit),
+    ("POST", r"/user/repos", FakeGitHubHandler.create_repo),
+    ("POST", r"/graphql", FakeGitHubHandler.graphql),
+    ("GET", R, FakeGitHubHandler.get_repo),
+    ("GET", R + r"/contents/?(.*)", FakeGitHubHandler.get_contents),
+    ("PUT", R + r"/contents/(.+)", FakeGitHubHandler.put_contents),
+    ("DELETE", R + r"/contents/(.+)", FakeGitHubHandler.delete_contents),
+    ("GET", R + r"/git/trees/(.+)", FakeGitHubHandler.get_tree),
+    ("POST", R + r"/git/trees", FakeGitHubHandler.create_tree),
+    ("GET", R + r"/git/blobs/(\w+)", FakeGitHubHandler.get_blob),
+    ("POST", R + r"/git/blobs", FakeGitHubHandler.create_blob),
+    ("GET", R + r"/git/commits/(\w+)", FakeGitHubHandler.get_commit),
+    ("POST", R + r"/git/commits", FakeGitHubHandler.create_commit),
+    ("GET", R + r"/git/ref/(.+)", FakeGitHubHandler.get_ref),
+    ("PATCH", R + r"/git/refs/(.+)", FakeGitHubHandler.update_ref),
+    ("POST", R + r"/git/refs", FakeGitHubHandler.create_ref),
+    ("GET", R + r"/(tarball|zipball)/(.+)", FakeGitHubHandler.get_archive),
+    ("GET", r"/_archive/([^/]+)/([^/]+)/(.+)\.tar\.gz", FakeGitHubHandler.get_archive_data),
+]
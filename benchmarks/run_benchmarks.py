@@ -0,0 +1,216 @@
+"""Network benchmarks for GitHubSync against a local fake GitHub server
+
+Runs the main GitHubSync operations against benchmarks/fake_github.py for
+a range of repository sizes and reports wall time, request count and
+bytes moved per operation. Each operation runs twice per size: "cold"
+with a fresh GitHubSync, and "warm" on the same instance, which is what a
+second command in the same session costs.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 10,1000 --latency 50
+    python benchmarks/run_benchmarks.py --json results.json
+    python benchmarks/run_benchmarks.py --compare results.json
+
+--compare exits non-zero when an operation needs more requests than in
+the saved run, or is more than --tolerance slower.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# Keep config, caches and mirrors away from the real ~/.codelens
+START_DIR = os.getcwd()
+os.environ["HOME"] = tempfile.mkdtemp(prefix="codelens-bench-")
+os.chdir(os.environ["HOME"])
+
+from rich.console import Console
+from rich.table import Table
+from fake_github import FakeGitHub
+
+console = Console()
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+FILES_PER_CATEGORY = 100
+LOGIN = "student"
+COMMUNITY_REPO = f"{LOGIN}/community"
+
+def java_source(number):
+    """A small but realistic example file"""
+    return (
+        f"public class Example{number:05d} {{\n"
+        f"    // Prints the square of {number}\n"
+        f"    public static void main(String[] args) {{\n"
+        f"        int value = {number};\n"
+        f"        System.out.println(value * value);\n"
+        f"    }}\n"
+        f"}}\n"
+        f"// output\n"
+        f"// {number * number}\n"
+    )
+
+def make_files(count):
+    """{path: source} spread over categories of FILES_PER_CATEGORY files"""
+    return {
+        f"cat{number // FILES_PER_CATEGORY:03d}/Example{number:05d}.java": java_source(number)
+        for number in range(count)
+    }
+
+def seed(fake, size):
+    """Create the personal and community repositories for one size"""
+    files = make_files(size)
+    fake.create_repo(LOGIN, "codelens-java-codes", files)
+    community = dict(files)
+    community["contributors/verified_contributors.json"] = json.dumps([LOGIN])
+    fake.create_repo(*COMMUNITY_REPO.split("/"), community)
+    return next(iter(files))
+
+def operations(sample_path):
+    """(name, callable taking a GitHubSync) for every benchmarked operation"""
+    upload_path = Path("upload") / "Upload.java"
+    upload_path.parent.mkdir(exist_ok=True)
+    upload_path.write_text(java_source(99999))
+    download_path = Path("downloads") / os.path.basename(sample_path)
+    return [
+        ("list_remote_files", lambda gs: gs.list_remote_files()),
+        ("upload_file", lambda gs: gs.upload_file(str(upload_path), "bench")),
+        ("download_file", lambda gs: gs.download_file(sample_path, download_path)),
+        ("fetch_from_community", lambda gs: gs.fetch_from_community()),
+        ("is_verified_contributor", lambda gs: gs.is_verified_contributor()),
+    ]
+
+def measure(fake, operation, gs):
+    fake.reset_counters()
+    start = time.perf_counter()
+    operation(gs)
+    wall = time.perf_counter() - start
+    return {
+        "wall_ms": round(wall * 1000, 2),
+        "requests": fake.request_count,
+        "bytes_out": fake.bytes_received,
+        "bytes_in": fake.bytes_sent
+    }
+
+def run_size(size, latency, rate_limit, rate_reset):
+    """Benchmark every operation against a fresh server seeded with size files"""
+    import github_sync
+    from config_manager import ConfigManager
+
+    fake = FakeGitHub(login=LOGIN, latency=latency, rate_limit=rate_limit, rate_reset=rate_reset).start()
+    try:
+        sample_path = seed(fake, size)
+        ConfigManager().set("github_api_url", fake.base_url)
+        results = []
+        for name, operation in operations(sample_path):
+            gs = github_sync.GitHubSync()
+            gs.community_repo = COMMUNITY_REPO
+            for run in ("cold", "warm"):
+                result = {"size": size, "operation": name, "run": run}
+                result.update(measure(fake, operation, gs))
+                results.append(result)
+        return results
+    finally:
+        fake.stop()
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+def show(results, baseline=None):
+    table = Table(title="GitHubSync benchmarks")
+    table.add_column("Files", justify="right")
+    table.add_column("Operation")
+    table.add_column("Run")
+    table.add_column("Wall", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Sent", justify="right")
+    table.add_column("Received", justify="right")
+    for result in results:
+        wall = f"{result['wall_ms']:.1f} ms"
+        requests = str(result["requests"])
+        previous = baseline.get(key(result)) if baseline else None
+        if previous:
+            wall += f" ({result['wall_ms'] - previous['wall_ms']:+.1f})"
+            requests += f" ({result['requests'] - previous['requests']:+d})"
+        table.add_row(
+            str(result["size"]), result["operation"], result["run"], wall, requests,
+            format_bytes(result["bytes_out"]), format_bytes(result["bytes_in"])
+        )
+    console.print(table)
+
+def key(result):
+    return f"{result['size']}/{result['operation']}/{result['run']}"
+
+def regressions(results, baseline, tolerance):
+    """Descriptions of operations that got worse than the baseline"""
+    found = []
+    for result in results:
+        previous = baseline.get(key(result))
+        if not previous:
+            continue
+        if result["requests"] > previous["requests"]:
+            found.append(f"{key(result)}: {previous['requests']} -> {result['requests']} requests")
+        # Small absolute differences are noise, whatever the ratio
+        if result["wall_ms"] > previous["wall_ms"] * (1 + tolerance) and result["wall_ms"] - previous["wall_ms"] > 5:
+            found.append(f"{key(result)}: {previous['wall_ms']:.1f} -> {result['wall_ms']:.1f} ms")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GitHubSync against a local fake GitHub server")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated repository sizes in files")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request, in ms")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="requests allowed per rate-limit window")
+    parser.add_argument("--rate-reset", type=int, default=3600, help="length of the rate-limit window, in seconds")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed wall-time slowdown for --compare")
+    args = parser.parse_args()
+
+    # GitHubSync reports every step on its own console; keep the table readable
+    import github_auth
+    import github_sync
+    github_auth.console.quiet = True
+    github_sync.console.quiet = True
+
+    from config_manager import ConfigManager
+    ConfigManager().save_github_token("benchmark-token")
+    # Write pacing protects the real API; here it would only time the sleep
+    ConfigManager().set("write_interval", 0)
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(START_DIR, args.compare), 'r') as f:
+            baseline = {key(result): result for result in json.load(f)["results"]}
+
+    results = []
+    for size in [int(size) for size in args.sizes.split(",") if size.strip()]:
+        console.print(f"[cyan]Benchmarking {size} files...[/cyan]")
+        results.extend(run_size(size, args.latency / 1000, args.rate_limit, args.rate_reset))
+    show(results, baseline)
+
+    if args.json:
+        with open(os.path.join(START_DIR, args.json), 'w') as f:
+            json.dump({"latency_ms": args.latency, "results": results}, f, indent=2)
+        console.print(f"[green]Results written to {args.json}[/green]")
+
+    if baseline:
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            console.print(f"[red]Regression: {line}[/red]")
+        if found:
+            sys.exit(1)
+        console.print("[green]No regressions against the baseline[/green]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from fs_utils import atomic_write
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+NO_COMMAND = "(none)"
+
+# Label set by attribute(), overriding ApiMetrics.current for this context
+_attributed = ContextVar("api_metrics_command", default=None)
+
+class CommandStats:
+    """GitHub API usage accumulated for one CLI command"""
+
+    def __init__(self):
+        self.runs = 0
+        self.wall = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.histogram = [0] * len(LATENCY_BUCKETS)
+        self.rate_used = {}  # resource -> requests charged against its limit
+
+    def observe(self, elapsed_ms, status, sent, received):
+        self.requests += 1
+        if status == 304:
+            self.not_modified += 1
+        elif status >= 400:
+            self.errors += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.latency_total += elapsed_ms
+        self.latency_max = max(self.latency_max, elapsed_ms)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed_ms <= bound:
+                self.histogram[index] += 1
+                break
+
+    def percentile(self, fraction):
+        """Latency (ms) at a percentile, as the upper bound of its bucket"""
+        target = self.requests * fraction
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def to_dict(self):
+        return {
+            "runs": self.runs,
+            "wall_seconds": round(self.wall, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "not_modified": self.not_modified,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_ms": {
+                "mean": round(self.latency_total / self.requests, 1) if self.requests else 0,
+                "p50": round(self.percentile(0.5), 1),
+                "p95": round(self.percentile(0.95), 1),
+                "max": round(self.latency_max, 1),
+                "buckets": {
+                    ("inf" if bound == float("inf") else str(bound)): count
+                    for bound, count in zip(LATENCY_BUCKETS, self.histogram)
+                }
+            },
+            "rate_limit_used": dict(self.rate_used)
+        }
+
+class ApiMetrics:
+    """Per-command instrumentation of every GitHub HTTP request
+
+    Installed as the innermost transport middleware, so each request that
+    reaches the network is counted once (retries included, answers from
+    the HTTP cache excluded). Requests are attributed to the foreground
+    command set with command(). Work that outlives its command - background
+    jobs, the upload flusher - runs under attribute(), which labels the
+    requests of its own thread (and of pools it hands its context to).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = {}
+        self.current = NO_COMMAND
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.remaining = {}  # resource -> (remaining, limit, reset) last seen
+
+    @contextmanager
+    def command(self, name):
+        """Attribute requests made inside the block to a CLI command"""
+        with self.lock:
+            previous, self.current = self.current, name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.current = previous
+                stats = self.commands.get(name)
+                # Commands that never touched GitHub are not reported
+                if stats is not None:
+                    stats.runs += 1
+                    stats.wall += time.perf_counter() - started
+
+    @contextmanager
+    def attribute(self, name):
+        """Attribute requests made in this context to name, whatever command is current"""
+        token = _attributed.set(name)
+        try:
+            yield
+        finally:
+            _attributed.reset(token)
+
+    def _rate_used(self, stats, headers):
+        try:
+            remaining = int(headers["x-ratelimit-remaining"])
+            limit = int(headers["x-ratelimit-limit"])
+            reset = int(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            return
+        resource = headers.get("x-ratelimit-resource", "core")
+        last = self.remaining.get(resource)
+        if last is None or reset != last[2]:
+            used = limit - remaining if last is not None else 0  # A new window
+        elif remaining < last[0]:
+            used = last[0] - remaining
+        else:
+            return  # Same or older news from a concurrent request
+        if used:
+            stats.rate_used[resource] = stats.rate_used.get(resource, 0) + used
+        self.remaining[resource] = (remaining, limit, reset)
+
+    def record(self, status, elapsed_ms, sent=0, received=0, headers=None):
+        """Count one request against the attributed or current command"""
+        with self.lock:
+            name = _attributed.get() or self.current
+            stats = self.commands.get(name)
+            if stats is None:
+                stats = self.commands[name] = CommandStats()
+            stats.observe(elapsed_ms, status, sent, received)
+            if headers:
+                self._rate_used(stats, headers)
+
+    def middleware(self, request, send):
+        """Transport middleware timing and sizing one request"""
+        started = time.perf_counter()
+        response = send(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        headers = {k.lower(): v for k, v in response.getheaders()}
+        try:
+            received = int(headers["content-length"])
+        except (KeyError, ValueError):
+            received = 0 if request["stream"] else len(response.read() or "")
+        self.record(response.status, elapsed_ms, body_size(request["data"]), received, headers)
+        return response
+
+    def snapshot(self):
+        """All statistics as plain data, ready for JSON"""
+        with self.lock:
+            return {
+                "session_started": self.started_at,
+                "exported_at": datetime.now().isoformat(timespec="seconds"),
+                "rate_limit_remaining": {
+                    resource: {"remaining": remaining, "limit": limit}
+                    for resource, (remaining, limit, _) in self.remaining.items()
+                },
+                "commands": {name: stats.to_dict() for name, stats in self.commands.items()}
+            }
+
+    def export(self, path):
+        """Write the snapshot as JSON"""
+        atomic_write(path, json.dumps(self.snapshot(), indent=2))
+
+def body_size(data):
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    try:
+        return len(data)
+    except TypeError:
+        return 0  # A generator body of unknown size
+
+_metrics = None
+
+def get_metrics():
+    """Process-wide API metrics; exported on exit if api_stats_file is set"""
+    global _metrics
+    if _metrics is None:
+        _metrics = ApiMetrics()
+        from config_manager import ConfigManager
+        export_path = ConfigManager().get("api_stats_file")
+        if export_path:
+            atexit.register(_export_quietly, _metrics, os.path.expanduser(export_path))
+    return _metrics
+
+def _export_quietly(metrics, path):
+    try:
+        if metrics.commands:
+            metrics.export(path)
+    except OSError:
+        pass  # Nothing useful to do on the way out
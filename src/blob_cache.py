@@ -0,0 +1,128 @@
+import os
+import threading
+from pathlib import Path
+from config_manager import ConfigManager
+from fs_utils import atomic_write, git_blob_sha
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class BlobCache:
+    """Content-addressed cache of downloaded files keyed by git blob SHA
+
+    Blobs live under ~/.codelens/cache/<sha[:2]>/<sha[2:]>. A blob's
+    mtime doubles as its last-used time, so eviction drops the least
+    recently used blobs once the size budget is exceeded. Every read is
+    verified against its SHA and corrupt entries are discarded.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".codelens" / "cache"
+        if max_bytes is None:
+            max_bytes = ConfigManager().get("cache_max_bytes", DEFAULT_MAX_BYTES)
+        self.max_bytes = int(max_bytes)
+        self.lock = threading.Lock()
+        self._size = None
+
+    def _blob_path(self, sha):
+        return self.cache_dir / sha[:2] / sha[2:]
+
+    def _entries(self):
+        """Yield (path, stat) for every cached blob"""
+        if not self.cache_dir.exists():
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.startswith('.'):
+                    yield entry.path, entry.stat()
+
+    def current_size(self):
+        """Total bytes held by the cache, scanned once per process"""
+        with self.lock:
+            if self._size is None:
+                self._size = sum(stat.st_size for _, stat in self._entries())
+            return self._size
+
+    def get(self, sha):
+        """Return cached content for a blob SHA, or None on a miss"""
+        if not sha:
+            return None
+        path = self._blob_path(sha)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        if git_blob_sha(data) != sha:
+            self._discard(path)
+            return None
+        
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, sha, data):
+        """Store content under its blob SHA, evicting old blobs if needed"""
+        if not sha or git_blob_sha(data) != sha or len(data) > self.max_bytes:
+            return False
+        path = self._blob_path(sha)
+        if path.exists():
+            return True
+        
+        atomic_write(path, data)
+        self.current_size()
+        with self.lock:
+            self._size += len(data)
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+        return True
+
+    def evict(self, target_ratio=0.9):
+        """Drop least recently used blobs until under the size budget"""
+        with self.lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+            total = sum(stat.st_size for _, stat in entries)
+            target = self.max_bytes * target_ratio
+            for path, stat in entries:
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= stat.st_size
+                except OSError:
+                    pass
+            self._size = total
+
+    def _discard(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return
+        with self.lock:
+            if self._size is not None:
+                self._size -= size
+
+    def clear(self):
+        """Remove every cached blob"""
+        with self.lock:
+            for path, _ in list(self._entries()):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+_blob_cache = None
+
+def get_blob_cache():
+    """Return the shared blob cache for this process"""
+    global _blob_cache
+    if _blob_cache is None:
+        _blob_cache = BlobCache()
+    return _blob_cache
@@ -1,69 +1,87 @@
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
+from fs_utils import atomic_write
 
 class ConfigManager:
+    """Access to ~/.codelens/config.json
+
+    The parsed file is shared by every ConfigManager in the process and
+    only re-read when its mtime or size changes, so callers can create
+    instances freely. Writes go through a temp file and rename, so a
+    concurrent reader or another CodeLens process never sees a partial
+    file.
+    """
+
+    _cache = {}  # config path -> ((mtime_ns, size), parsed config)
+    _known_dirs = set()
+    _lock = threading.Lock()
+
     def __init__(self):
         self.config_dir = Path.home() / ".codelens"
         self.config_file = self.config_dir / "config.json"
         self.ensure_config_dir()
-        print(f"DEBUG: Config path: {self.config_file}")  # Debug
-    
+
     def ensure_config_dir(self):
         """Create config directory if it doesn't exist"""
-        self.config_dir.mkdir(exist_ok=True)
-    
+        if self.config_dir not in ConfigManager._known_dirs:
+            self.config_dir.mkdir(exist_ok=True)
+            ConfigManager._known_dirs.add(self.config_dir)
+
+    def _load(self) -> Dict[str, Any]:
+        """Return the parsed config, re-reading only if the file changed"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return {}
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with ConfigManager._lock:
+            cached = ConfigManager._cache.get(self.config_file)
+            if cached and cached[0] == signature:
+                return cached[1]
+            try:
+                with open(self.config_file, 'r') as f:
+                    config = json.load(f)
+            except Exception:
+                config = {}
+            ConfigManager._cache[self.config_file] = (signature, config)
+            return config
+
+    def _save(self, config: Dict[str, Any]):
+        """Atomically replace the config file and refresh the cache"""
+        with ConfigManager._lock:
+            atomic_write(self.config_file, json.dumps(config, indent=2))
+            stat = os.stat(self.config_file)
+            ConfigManager._cache[self.config_file] = ((stat.st_mtime_ns, stat.st_size), config)
+
     def is_authenticated(self) -> bool:
         """Check if user has GitHub token"""
-        token = self.get_github_token()
-        print(f"DEBUG: Checking auth - token exists: {token is not None}")  # Debug
-        return token is not None
-    
+        return self.get_github_token() is not None
+
     def get_github_token(self) -> Optional[str]:
         """Get GitHub token from config"""
-        print(f"DEBUG: Looking for config at: {self.config_file}")  # Debug
-        print(f"DEBUG: Config exists: {self.config_file.exists()}")  # Debug
-        
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    token = config.get('github_token')
-                    print(f"DEBUG: Token from file: {token}")  # Debug
-                    return token
-            except Exception as e:
-                print(f"DEBUG: Error reading config: {e}")  # Debug
-                return None
-        return None
-    
+        return self._load().get('github_token')
+
     def save_github_token(self, token: str):
         """Save GitHub token to config"""
-        config = {}
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-            except Exception as e:
-                print(f"DEBUG: Error reading existing config: {e}")  # Debug
-                config = {}
-        
-        config['github_token'] = token
-        print(f"DEBUG: Saving token to config: {token}")  # Debug
-        
+        self.set('github_token', token)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a single configuration value"""
+        return self._load().get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Set a single configuration value"""
+        config = dict(self._load())
+        config[key] = value
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
-            print(f"DEBUG: Config saved successfully")  # Debug
+            self._save(config)
         except Exception as e:
-            print(f"DEBUG: Error saving config: {e}")  # Debug
-    
+            print(f"Error saving config: {e}")
+
     def get_config(self) -> Dict[str, Any]:
         """Get all configuration"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
\ No newline at end of file
+        return dict(self._load())
@@ -0,0 +1,157 @@
+import os
+import threading
+
+class IndexEntry:
+    """Compact record of one file or directory in the index"""
+    __slots__ = ("name", "is_dir", "size", "mtime")
+
+    def __init__(self, name, is_dir, size, mtime):
+        self.name = name
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+
+class DirectoryIndex:
+    """In-memory tree of java_files/ kept current by watchdog events
+
+    The tree is scanned once with os.scandir. Afterwards create, modify,
+    delete and move events patch single entries in place, so directory
+    listings are served from memory without touching the disk. Directories
+    are keyed by their path relative to the root ("" for the root itself).
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.lock = threading.RLock()
+        self.dirs = {}
+        self._sorted = {}
+        self.build()
+
+    def build(self):
+        """Scan the whole tree from scratch"""
+        with self.lock:
+            self.dirs = {}
+            self._sorted = {}
+            self._scan("")
+
+    def _scan(self, rel_dir):
+        """Index rel_dir and everything below it"""
+        pending = [rel_dir]
+        while pending:
+            current = pending.pop()
+            entries = {}
+            try:
+                with os.scandir(os.path.join(self.root, current)) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries[entry.name] = IndexEntry(
+                            entry.name, is_dir, 0 if is_dir else stat.st_size, stat.st_mtime
+                        )
+                        if is_dir:
+                            pending.append(self._join(current, entry.name))
+            except OSError:
+                continue
+            self.dirs[current] = entries
+            self._sorted.pop(current, None)
+
+    @staticmethod
+    def _join(rel_dir, name):
+        return f"{rel_dir}/{name}" if rel_dir else name
+
+    def relative(self, path):
+        """Path relative to the root using '/' separators, or None if outside"""
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == ".":
+            return ""
+        if rel.startswith(".."):
+            return None
+        return rel.replace(os.sep, "/")
+
+    def listing(self, path):
+        """Entries of a directory, directories first, sorted by name"""
+        rel = self.relative(path)
+        with self.lock:
+            cached = self._sorted.get(rel)
+            if cached is None:
+                entries = self.dirs.get(rel)
+                if entries is None:
+                    return None
+                cached = sorted(entries.values(), key=lambda e: (not e.is_dir, e.name))
+                self._sorted[rel] = cached
+            return cached
+
+    def is_dir(self, path):
+        rel = self.relative(path)
+        with self.lock:
+            return rel is not None and rel in self.dirs
+
+    def is_file(self, path):
+        rel = self.relative(path)
+        if not rel:
+            return False
+        parent, _, name = rel.rpartition("/")
+        with self.lock:
+            entry = self.dirs.get(parent, {}).get(name)
+            return entry is not None and not entry.is_dir
+
+    def _split(self, path):
+        rel = self.relative(path)
+        if not rel:
+            return None, None, None
+        parent, _, name = rel.rpartition("/")
+        return rel, parent, name
+
+    def on_created(self, path, is_dir):
+        rel, parent, name = self._split(path)
+        if rel is None:
+            return
+        with self.lock:
+            if parent not in self.dirs:
+                return
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return
+            self.dirs[parent][name] = IndexEntry(name, is_dir, 0 if is_dir else stat.st_size, stat.st_mtime)
+            self._sorted.pop(parent, None)
+            if is_dir:
+                self._scan(rel)
+
+    def on_modified(self, path, is_dir):
+        rel, parent, name = self._split(path)
+        if rel is None:
+            return
+        with self.lock:
+            entry = self.dirs.get(parent, {}).get(name)
+            if entry is None:
+                self.on_created(path, is_dir)
+                return
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return
+            entry.mtime = stat.st_mtime
+            if not entry.is_dir:
+                entry.size = stat.st_size
+
+    def on_deleted(self, path, is_dir=None):
+        rel, parent, name = self._split(path)
+        if rel is None:
+            return
+        with self.lock:
+            entry = self.dirs.get(parent, {}).pop(name, None)
+            self._sorted.pop(parent, None)
+            if (entry is not None and entry.is_dir) or is_dir:
+                prefix = f"{rel}/"
+                for key in [k for k in self.dirs if k == rel or k.startswith(prefix)]:
+                    del self.dirs[key]
+                    self._sorted.pop(key, None)
+
+    def on_moved(self, src_path, dest_path, is_dir):
+        with self.lock:
+            self.on_deleted(src_path, is_dir)
+            self.on_created(dest_path, is_dir)
@@ -0,0 +1,246 @@
+import base64
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextvars
+import json
+import os
+from blob_cache import get_blob_cache
+from config_manager import ConfigManager
+from fs_utils import atomic_write, file_blob_sha, git_blob_sha
+from progress import NULL_PROGRESS
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_GRAPHQL_BATCH = 50
+GRAPHQL_MAX_BYTES = 2 * 1024 * 1024  # known content size per GraphQL query
+GRAPHQL_MAX_BLOB = 512 * 1024        # larger files skip GraphQL, whose text may truncate
+
+def submit(pool, fn, *args):
+    """pool.submit in a copy of the caller's context, so workers keep its API metrics label"""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+class DownloadExecutor:
+    """Download many repository files concurrently into java_files/
+
+    The repository handle is resolved once by the caller and shared by all
+    workers. Each item is a dict with remote_path, local_path and, when
+    known from the tree manifest, the blob sha.
+    """
+
+    def __init__(self, repo, max_workers=None, cache=None, mirror=None):
+        self.repo = repo
+        self.cache = cache or get_blob_cache()
+        self.mirror = mirror
+        config = ConfigManager()
+        if max_workers is None:
+            max_workers = config.get("download_concurrency", DEFAULT_CONCURRENCY)
+        self.max_workers = max(1, int(max_workers))
+        self.use_graphql = config.get("graphql_fetch", True)
+        self.batch_size = max(1, int(config.get("graphql_batch_size", DEFAULT_GRAPHQL_BATCH)))
+
+    def fetch_content(self, item):
+        """Return (raw bytes, source) of one remote file, cache first"""
+        sha = item.get("sha")
+        cached = self.cache.get(sha)
+        if cached is not None:
+            return cached, "cache"
+        
+        if sha:
+            blob = self.repo.get_git_blob(sha)
+            content = base64.b64decode(blob.content)
+        else:
+            file_content = self.repo.get_contents(item["remote_path"])
+            content, sha = file_content.decoded_content, file_content.sha
+        self.cache.put(sha, content)
+        return content, "network"
+
+    def download_one(self, item):
+        local_path = item["local_path"]
+        if item.get("sha") and os.path.isfile(local_path) and file_blob_sha(local_path) == item["sha"]:
+            return 0, "local"
+        content, source = self.fetch_content(item)
+        atomic_write(local_path, content)
+        return len(content), source
+
+    def resolve_offline(self, item):
+        """Satisfy an item from disk or the blob cache; None if it needs the network"""
+        local_path = item["local_path"]
+        sha = item.get("sha")
+        if not sha:
+            return None
+        if os.path.isfile(local_path) and file_blob_sha(local_path) == sha:
+            return 0, "local"
+        cached = self.cache.get(sha)
+        if cached is None:
+            return None
+        atomic_write(local_path, cached)
+        return len(cached), "cache"
+
+    def download_from_mirror(self, items):
+        """Fetch missing blobs into the git mirror at once and write them out
+
+        Returns (results, items still to fetch); any mirror failure leaves
+        the items to the API paths.
+        """
+        with_sha = [item for item in items if item.get("sha")]
+        rest = [item for item in items if not item.get("sha")]
+        try:
+            self.mirror.prefetch([item["sha"] for item in with_sha])
+        except Exception:
+            return [], items
+        results = []
+        for item in with_sha:
+            try:
+                content = self.mirror.read(item["sha"])
+            except Exception:
+                rest.append(item)
+                continue
+            try:
+                atomic_write(item["local_path"], content)
+                self.cache.put(item["sha"], content)
+                results.append(self._result(item, True, len(content), "mirror"))
+            except Exception as e:
+                results.append(self._result(item, False, 0, None, str(e)))
+        return results, rest
+
+    def chunk(self, items):
+        """Split items into GraphQL batches bounded by count and known size"""
+        batches = []
+        current = []
+        current_bytes = 0
+        for item in items:
+            size = item.get("size") or 0
+            if current and (len(current) >= self.batch_size or current_bytes + size > GRAPHQL_MAX_BYTES):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(item)
+            current_bytes += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def fetch_batch(self, items):
+        """Fetch text blobs for many items with one GraphQL query
+
+        Returns {index: content} for the items that came back as complete
+        text whose SHA checks out; binary, truncated, missing or mismatched
+        blobs are left for the REST fallback.
+        """
+        owner, name = self.repo.full_name.split("/", 1)
+        ref = self.repo.default_branch
+        lookups = []
+        for index, item in enumerate(items):
+            expression = json.dumps(f"{ref}:{item['remote_path']}")
+            lookups.append(
+                f"f{index}: object(expression: {expression}) "
+                "{ ... on Blob { oid byteSize isBinary isTruncated text } }"
+            )
+        lookups = "\n".join(lookups)
+        query = f"query {{ repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{\n{lookups}\n}} }}"
+        _, data = self.repo.requester.graphql_query(query, {})
+        repository = (data.get("data") or {}).get("repository") or {}
+        
+        contents = {}
+        for index, item in enumerate(items):
+            blob = repository.get(f"f{index}")
+            if not blob or blob.get("isBinary") or blob.get("isTruncated") or blob.get("text") is None:
+                continue
+            content = blob["text"].encode("utf-8")
+            sha = git_blob_sha(content)
+            # Text that didn't survive the UTF-8 round trip is refetched raw
+            if sha != blob["oid"] or (item.get("sha") and sha != item["sha"]):
+                continue
+            self.cache.put(sha, content)
+            contents[index] = content
+        return contents
+
+    def download_batch(self, items):
+        """Download a GraphQL batch; returns (results, items needing REST)"""
+        try:
+            contents = self.fetch_batch(items)
+        except Exception:
+            return [], items  # Whole batch falls back to REST
+        results = []
+        fallback = []
+        for index, item in enumerate(items):
+            content = contents.get(index)
+            if content is None:
+                fallback.append(item)
+                continue
+            try:
+                atomic_write(item["local_path"], content)
+                results.append(self._result(item, True, len(content), "network"))
+            except Exception as e:
+                results.append(self._result(item, False, 0, None, str(e)))
+        return results, fallback
+
+    @staticmethod
+    def _result(item, ok, size=0, source=None, error=None):
+        return {"item": item, "ok": ok, "bytes": size, "source": source, "error": error}
+
+    def download(self, items, on_result=None, progress=NULL_PROGRESS):
+        """Download all items, reporting each result as it completes
+
+        Returns a list of result dicts (item, ok, bytes, source, error) where
+        source is "local" (already up to date), "cache", "mirror" or "network". on_result
+        is called from the calling thread, so it may print freely.
+
+        Items are first checked against the local file and the blob cache.
+        With a git mirror, what is left arrives in one pack fetch; otherwise
+        it is fetched as text in GraphQL batches, so a category costs a few
+        requests. Binary, oversized and unreadable files then go through
+        the REST blob API one by one.
+        """
+        results = []
+        if not items:
+            return results
+        
+        def report(result):
+            results.append(result)
+            progress.advance(result["item"]["remote_path"], result["bytes"])
+            if on_result:
+                on_result(result)
+        
+        progress.start(len(items), f"Downloading {len(items)} files")
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                remote = []
+                futures = {submit(pool, self.resolve_offline, item): item for item in items}
+                for future in as_completed(futures):
+                    item = futures[future]
+                    try:
+                        resolved = future.result()
+                    except Exception:
+                        resolved = None
+                    if resolved is None:
+                        remote.append(item)
+                    else:
+                        report(self._result(item, True, *resolved))
+            
+                if self.mirror and remote:
+                    mirror_results, remote = self.download_from_mirror(remote)
+                    for result in mirror_results:
+                        report(result)
+            
+                if self.use_graphql:
+                    batchable = [item for item in remote if (item.get("size") or 0) <= GRAPHQL_MAX_BLOB]
+                    remote = [item for item in remote if (item.get("size") or 0) > GRAPHQL_MAX_BLOB]
+                    futures = [submit(pool, self.download_batch, batch) for batch in self.chunk(batchable)]
+                    for future in as_completed(futures):
+                        batch_results, fallback = future.result()
+                        for result in batch_results:
+                            report(result)
+                        remote.extend(fallback)
+            
+                futures = {submit(pool, self.download_one, item): item for item in remote}
+                for future in as_completed(futures):
+                    item = futures[future]
+                    try:
+                        size, source = future.result()
+                        report(self._result(item, True, size, source))
+                    except Exception as e:
+                        report(self._result(item, False, 0, None, str(e)))
+            except BaseException:
+                # Cancelled or interrupted: don't wait for queued downloads
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return results
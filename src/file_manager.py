@@ -3,34 +3,78 @@ from watchdog.events import FileSystemEventHandler
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
+from rich.markup import escape
 import rich.box as rich_box
+from directory_index import DirectoryIndex
+from source_parser import MetadataIndex
 
 class FileChangeHandler(FileSystemEventHandler):
     def __init__(self, callback):
         self.callback = callback
     
     def on_modified(self, event):
-        self.callback()
+        self.callback(event)
     
     def on_created(self, event):
-        self.callback()
+        self.callback(event)
     
     def on_deleted(self, event):
-        self.callback()
+        self.callback(event)
+    
+    def on_moved(self, event):
+        self.callback(event)
 
 class FileManager:
     def __init__(self, base_path="java_files"):
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
+        self.index = DirectoryIndex(self.base_path)
         self.observer = Observer()
         self.file_changed = False
+        self.listeners = []
+        self.metadata = MetadataIndex(self.base_path)
+        self.add_listener(self.metadata.on_event)
         
         event_handler = FileChangeHandler(self.on_file_change)
-        self.observer.schedule(event_handler, self.base_path, recursive=True)
+        self.observer.schedule(event_handler, str(self.base_path), recursive=True)
         self.observer.start()
     
-    def on_file_change(self):
+    def add_listener(self, callback):
+        """Call callback(event) for every watchdog event after indexing"""
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
+    def on_file_change(self, event):
+        """Apply a watchdog event to the in-memory index"""
+        self._update_index(event)
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                # A failing listener must not stop the watchdog thread
+                Console().print(f"[red]File watcher error: {e}[/red]")
+    
+    def _update_index(self, event):
+        if event.event_type == "created":
+            self.index.on_created(event.src_path, event.is_directory)
+        elif event.event_type == "modified":
+            self.index.on_modified(event.src_path, event.is_directory)
+            if event.is_directory:
+                return  # Directory mtime bumps are not worth a redraw
+        elif event.event_type == "deleted":
+            self.index.on_deleted(event.src_path, event.is_directory)
+        elif event.event_type == "moved":
+            self.index.on_moved(event.src_path, event.dest_path, event.is_directory)
         self.file_changed = True
+    
+    def is_directory(self, path):
+        return self.index.is_dir(path)
+    
+    def is_file(self, path):
+        return self.index.is_file(path)
 
     def list_directory(self, path=None):
         current_path = self.base_path if path is None else Path(path)
@@ -42,17 +86,29 @@ class FileManager:
                 "name": "..",
                 "type": "DIR",
                 "size": "-",
-                "modified": "-"
+                "modified": "-",
+                "meta": None
             })
         
-        for item in sorted(current_path.iterdir(), key=lambda x: (x.is_file(), x.name)):
-            stat = item.stat()
+        entries = self.index.listing(current_path)
+        if entries is None:
+            # Not indexed yet (e.g. created before the watcher caught up)
+            self.index.build()
+            entries = self.index.listing(current_path) or []
+        
+        for entry in entries:
+            meta = None
+            if not entry.is_dir:
+                meta = self.metadata.get(current_path / entry.name, entry.mtime, entry.size)
             items.append({
-                "name": item.name,
-                "type": "DIR" if item.is_dir() else "FILE",
-                "size": f"{stat.st_size/1024:.1f}KB" if item.is_file() else "-",
-                "modified": "-"  # Can add modified time if needed
+                "name": entry.name,
+                "type": "DIR" if entry.is_dir else "FILE",
+                "size": "-" if entry.is_dir else f"{entry.size/1024:.1f}KB",
+                "modified": "-",  # Can add modified time if needed
+                "meta": meta
             })
+        # Persist anything parsed for the first time
+        self.metadata.save()
         return items, str(current_path)
     
     def display_files_table(self, items, current_path):
@@ -65,17 +121,30 @@ class FileManager:
             border_style="bright_blue"
         )
         
-        table.add_column("Type", width=8, style="bold green")
+        table.add_column("Type", width=6, style="bold green")
         table.add_column("Name", style="white")
-        table.add_column("Size", width=12, justify="right")
-        table.add_column("Actions", width=15, style="yellow")
+        table.add_column("Size", width=10, justify="right")
+        table.add_column("Lines", min_width=5, justify="right")
+        table.add_column("Output", justify="right", style="green")
+        table.add_column("Classes", style="cyan", max_width=24)
+        table.add_column("Actions", width=7, style="yellow")
         
         for item in items:
             action = "[bold]OPEN[/bold]" if item["type"] == "DIR" else "[cyan]VIEW[/cyan]"
+            meta = item.get("meta")
+            if meta:
+                lines = "-" if meta["lines"] is None else str(meta["lines"])
+                output = f"{meta['output_lines']} lines" if meta["has_output"] else "-"
+                classes = ", ".join(meta["classes"]) or "-"
+            else:
+                lines = output = classes = "-"
             table.add_row(
                 f"[bold]{item['type']}[/bold]",
                 item["name"],
                 item["size"],
+                lines,
+                output,
+                escape(classes),
                 action
             )
         
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+def atomic_write(path, data):
+    """Write bytes or text to path via a temp file and rename
+
+    Readers never observe a half-written file, and an interrupted write
+    leaves the previous content in place.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def git_blob_sha(data):
+    """Compute the git blob SHA-1 for in-memory content"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+def file_blob_sha(file_path, chunk_size=65536):
+    """Compute the git blob SHA-1 of a file without loading it whole"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(f"blob {size}\0".encode())
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def safe_join(root, rel_path):
+    """Join a repository path onto root, or None if it would escape root"""
+    parts = rel_path.split("/")
+    if rel_path.startswith("/") or any(part in ("", ".", "..") for part in parts) or "\\" in rel_path:
+        return None
+    target = Path(root).joinpath(*parts)
+    root = os.path.abspath(root)
+    if os.path.commonpath([root, os.path.abspath(target)]) != root:
+        return None
+    return target
@@ -0,0 +1,212 @@
+import base64
+import os
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path
+import git
+from gitdb import IStream
+
+EMPTY_SHA = "0" * 40
+DEFAULT_AUTHOR = ("CodeLens", "codelens@users.noreply.github.com")
+
+def _stdin(data):
+    """A real file for git's stdin; subprocess can't read from BytesIO"""
+    stream = tempfile.TemporaryFile()
+    stream.write(data)
+    stream.seek(0)
+    return stream
+
+class GitMirror:
+    """Bare partial clone of a repository under ~/.codelens/mirror
+
+    The clone is made with --filter=blob:none, so only commits and trees
+    are transferred up front; blobs arrive on demand, many per fetch.
+    Listing runs on the local trees, commits are written with plumbing
+    against a temporary index (no working tree), and pushes send only
+    the new objects. The token is passed per command through an
+    http.extraHeader environment override and never written to disk.
+    """
+
+    def __init__(self, remote_url, name, token=None, mirror_root=None):
+        self.remote_url = remote_url
+        self.mirror_root = Path(mirror_root) if mirror_root else Path.home() / ".codelens" / "mirror"
+        self.path = self.mirror_root / f"{name.replace('/', '__')}.git"
+        self.token = token
+        self.lock = threading.RLock()
+        self._repo = None
+
+    def _env(self):
+        env = {"GIT_TERMINAL_PROMPT": "0"}
+        if self.token:
+            credentials = base64.b64encode(f"x-access-token:{self.token}".encode()).decode()
+            env.update({
+                "GIT_CONFIG_COUNT": "1",
+                "GIT_CONFIG_KEY_0": "http.extraHeader",
+                "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}"
+            })
+        return env
+
+    def _git(self, *args, **kwargs):
+        """Run a git command in the mirror with the auth environment"""
+        env = dict(self._env(), **kwargs.pop("env", {}))
+        with self.repo.git.custom_environment(**env):
+            return self.repo.git.execute(["git", *args], **kwargs)
+
+    @property
+    def repo(self):
+        with self.lock:
+            if self._repo is None:
+                if (self.path / "HEAD").exists():
+                    self._repo = git.Repo(self.path)
+                else:
+                    self.mirror_root.mkdir(parents=True, exist_ok=True)
+                    self._repo = git.Repo.clone_from(
+                        self.remote_url, self.path, bare=True,
+                        multi_options=["--filter=blob:none"], env=self._env()
+                    )
+            return self._repo
+
+    def default_branch(self):
+        """Branch the remote HEAD pointed at when cloned"""
+        try:
+            return self._git("symbolic-ref", "--short", "HEAD")
+        except git.GitCommandError:
+            return "main"
+
+    def head(self, branch=None):
+        """Commit SHA of a local branch, or None for an empty repository"""
+        branch = branch or self.default_branch()
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", f"refs/heads/{branch}^{{commit}}")
+        except git.GitCommandError:
+            return None
+
+    def fetch(self, branch=None):
+        """Bring the branch up to date; only new commits and trees move"""
+        branch = branch or self.default_branch()
+        with self.lock:
+            try:
+                self._git("fetch", "--filter=blob:none", "--no-tags", "origin",
+                          f"+refs/heads/{branch}:refs/heads/{branch}")
+            except git.GitCommandError as e:
+                if "couldn't find remote ref" not in str(e):
+                    raise  # Anything but an empty remote is a real failure
+
+    def manifest(self, branch=None):
+        """Entries of the branch in the get_remote_manifest format
+
+        Sizes are not known locally without the blobs, so they are None.
+        """
+        head = self.head(branch)
+        if head is None:
+            return []
+        entries = []
+        for line in self._git("ls-tree", "-r", "-t", "-z", head, strip_newline_in_stdout=False).split("\0"):
+            if not line:
+                continue
+            info, path = line.split("\t", 1)
+            _, kind, sha = info.split()
+            if kind not in ("blob", "tree"):
+                continue
+            entries.append({
+                "name": path.rsplit("/", 1)[-1],
+                "path": path,
+                "type": "file" if kind == "blob" else "dir",
+                "size": None,
+                "sha": sha
+            })
+        return entries
+
+    def missing(self, shas, branch=None):
+        """The subset of blob SHAs not yet present in the mirror"""
+        head = self.head(branch)
+        if head is None:
+            return set(shas)
+        output = self._git("rev-list", "--objects", "--missing=print", head)
+        absent = {line[1:] for line in output.splitlines() if line.startswith("?")}
+        return absent & set(shas)
+
+    def prefetch(self, shas, branch=None):
+        """Download missing blobs in a single fetch"""
+        wanted = sorted(self.missing(shas, branch))
+        if not wanted:
+            return 0
+        with self.lock:
+            self._git(
+                "-c", "fetch.negotiationAlgorithm=noop",
+                "fetch", "origin", "--no-tags", "--no-write-fetch-head", "--recurse-submodules=no",
+                "--filter=blob:none", "--stdin",
+                istream=_stdin("\n".join(wanted).encode() + b"\n")
+            )
+        return len(wanted)
+
+    def read(self, sha):
+        """Raw content of a blob"""
+        return self._git("cat-file", "blob", sha, stdout_as_string=False, strip_newline_in_stdout=False)
+
+    def commit(self, files, message, deletions=(), branch=None, author=None):
+        """Commit files {path: bytes} and deletions on top of the branch
+
+        Builds the tree in a temporary index file, so nothing is checked
+        out. Returns the new commit SHA (not yet pushed).
+        """
+        branch = branch or self.default_branch()
+        with self.lock:
+            parent = self.head(branch)
+            lines = []
+            for path, content in files.items():
+                blob = self.repo.odb.store(IStream("blob", len(content), BytesIO(content)))
+                lines.append(f"100644 {blob.binsha.hex()}\t{path}")
+            for path in deletions:
+                lines.append(f"0 {EMPTY_SHA}\t{path}")
+
+            fd, index_file = tempfile.mkstemp(dir=self.path, prefix="codelens-index.")
+            os.close(fd)
+            os.unlink(index_file)  # git wants to create the index itself
+            name, email = author or DEFAULT_AUTHOR
+            env = {
+                "GIT_INDEX_FILE": index_file,
+                "GIT_AUTHOR_NAME": name, "GIT_AUTHOR_EMAIL": email,
+                "GIT_COMMITTER_NAME": name, "GIT_COMMITTER_EMAIL": email
+            }
+            try:
+                if parent:
+                    self._git("read-tree", parent, env=env)
+                self._git("update-index", "--index-info", env=env,
+                          istream=_stdin(("\n".join(lines) + "\n").encode("utf-8")))
+                tree = self._git("write-tree", env=env)
+                args = ["commit-tree", tree, "-m", message]
+                if parent:
+                    args += ["-p", parent]
+                commit = self._git(*args, env=env)
+            finally:
+                if os.path.exists(index_file):
+                    os.unlink(index_file)
+            self._git("update-ref", f"refs/heads/{branch}", commit, parent or EMPTY_SHA)
+            return commit
+
+    def push(self, branch=None):
+        """Send the branch to the remote; only missing objects travel"""
+        branch = branch or self.default_branch()
+        with self.lock:
+            self._git("push", "origin", f"refs/heads/{branch}:refs/heads/{branch}")
+
+    def commit_and_push(self, files, message, deletions=(), branch=None, author=None, attempts=2):
+        """Commit and push, rebuilding on the new head if the remote moved"""
+        branch = branch or self.default_branch()
+        for attempt in range(attempts):
+            self.fetch(branch)
+            parent = self.head(branch)
+            commit = self.commit(files, message, deletions, branch, author)
+            try:
+                self.push(branch)
+                return commit
+            except git.GitCommandError:
+                # Drop the rejected commit before rebuilding on the new head
+                if parent:
+                    self._git("update-ref", f"refs/heads/{branch}", parent, commit)
+                else:
+                    self._git("update-ref", "-d", f"refs/heads/{branch}", commit)
+                if attempt == attempts - 1:
+                    raise
@@ -69,8 +69,31 @@ def get_github_client():
     if token:
         console.print(f"DEBUG: Retrieved token length: {len(token)}")
         from github import Github
+        from github_transport import install_transport, add_middleware, DEFAULT_POOL_SIZE
         try:
-            return Github(token)
+            install_transport()
+            if config.get("http_cache", True):
+                from http_cache import get_http_cache
+                add_middleware(get_http_cache().middleware)
+            # The scheduler owns pacing and retries, so PyGithub's fixed
+            # delays and urllib3 retries are switched off
+            from rate_limiter import get_scheduler
+            add_middleware(get_scheduler().middleware)
+            # Innermost, so it sees each request that reaches the network
+            from api_metrics import get_metrics
+            add_middleware(get_metrics().middleware)
+            pool_size = config.get("pool_size", DEFAULT_POOL_SIZE)
+            # GitHub Enterprise, or the local server used by benchmarks/
+            api_url = config.get("github_api_url")
+            extra = {"base_url": api_url.rstrip("/")} if api_url else {}
+            return Github(
+                token,
+                pool_size=pool_size,
+                **extra,
+                retry=None,
+                seconds_between_requests=None,
+                seconds_between_writes=None
+            )
         except Exception as e:
             console.print(f"DEBUG: Failed to create client: {e}")
             return None
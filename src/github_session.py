@@ -0,0 +1,73 @@
+import threading
+import time
+from config_manager import ConfigManager
+
+DEFAULT_CONTRIBUTORS_TTL = 300  # seconds
+
+class GitHubSession:
+    """Per-process GitHub context shared by all GitHubSync operations
+
+    Resolves the authenticated user and repository handles once and keeps
+    the verified contributor list for a short TTL, so a command only pays
+    for the requests that actually move data. All requests share the
+    pooled keep-alive connection from github_transport.
+    """
+
+    def __init__(self, client, contributors_ttl=None):
+        self.client = client
+        if contributors_ttl is None:
+            contributors_ttl = ConfigManager().get("contributors_ttl", DEFAULT_CONTRIBUTORS_TTL)
+        self.contributors_ttl = contributors_ttl
+        self.lock = threading.RLock()
+        self._user = None
+        self._repos = {}
+        self._contributors = None
+        self._contributors_loaded_at = 0
+
+    @property
+    def user(self):
+        """The authenticated user, fetched on first use"""
+        with self.lock:
+            if self._user is None:
+                user = self.client.get_user()
+                user.login  # Complete the lazy object once
+                self._user = user
+            return self._user
+
+    @property
+    def login(self):
+        return self.user.login
+
+    def cached_repo(self, full_name):
+        """Return a previously resolved repository handle, if any"""
+        with self.lock:
+            return self._repos.get(full_name)
+
+    def remember_repo(self, repo, full_name=None):
+        """Keep a repository handle for the rest of the session"""
+        with self.lock:
+            self._repos[full_name or repo.full_name] = repo
+        return repo
+
+    def get_repo(self, full_name):
+        """Resolve a repository by owner/name, at most once per session"""
+        repo = self.cached_repo(full_name)
+        if repo is None:
+            repo = self.remember_repo(self.client.get_repo(full_name), full_name)
+        return repo
+
+    def contributors(self, loader):
+        """Return the contributor list, reloading it after the TTL expires"""
+        with self.lock:
+            age = time.monotonic() - self._contributors_loaded_at
+            if self._contributors is None or age > self.contributors_ttl:
+                self._contributors = loader()
+                self._contributors_loaded_at = time.monotonic()
+            return self._contributors
+
+    def invalidate(self):
+        """Forget everything resolved so far"""
+        with self.lock:
+            self._user = None
+            self._repos.clear()
+            self._contributors = None
@@ -1,15 +1,77 @@
 import json
+import base64
+import tarfile
+import time
 from datetime import datetime
 from github_auth import get_github_client
 import os
 from rich.panel import Panel
 from pathlib import Path
-from github import GithubException
+from github import GithubException, InputGitTreeElement
 from rich.console import Console
 import questionary
+from api_metrics import get_metrics
+from blob_cache import get_blob_cache
+from config_manager import ConfigManager
+from download_executor import DownloadExecutor
+from github_session import GitHubSession
+from jobs import JobCancelled
+from progress import NULL_PROGRESS
+from fs_utils import atomic_write, file_blob_sha, git_blob_sha, safe_join
+from github_transport import get_http_session
 
 console = Console()
 
+LARGE_FILE_BYTES = 1024 * 1024  # above this, uploads stream through the blobs API
+CONTENTS_LISTING_LIMIT = 1000   # entries the contents API returns for one directory
+
+def strip_attribution(content):
+    """Body of a community file without the contributor header uploads add"""
+    if content.startswith(b"// Contributor: "):
+        lines = content.split(b"\n", 3)
+        if len(lines) == 4 and lines[1].startswith(b"// Uploaded: ") and not lines[2]:
+            return lines[3]
+    return content
+
+def log_to(progress, message):
+    """Show a message through the operation's progress reporter
+
+    Background work always passes one (a job keeps its messages for
+    'jobs'); an operation called without one runs in the foreground and
+    prints to the console.
+    """
+    if progress is NULL_PROGRESS:
+        console.print(message)
+    else:
+        progress.log(message)
+
+class StreamedBlobBody:
+    """JSON body for POST /git/blobs that base64-encodes a file lazily
+
+    Iterating yields the request body in chunks, so a large file is never
+    held in memory whole or as base64. len() gives the exact body size
+    for Content-Length, and every iteration starts over, so a retried
+    request resends the full body.
+    """
+
+    PREFIX = b'{"encoding": "base64", "content": "'
+    SUFFIX = b'"}'
+    CHUNK = 3 * 64 * 1024  # multiple of 3 so chunks encode without padding
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.size = os.path.getsize(file_path)
+
+    def __len__(self):
+        return len(self.PREFIX) + 4 * ((self.size + 2) // 3) + len(self.SUFFIX)
+
+    def __iter__(self):
+        yield self.PREFIX
+        with open(self.file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.CHUNK), b""):
+                yield base64.b64encode(chunk)
+        yield self.SUFFIX
+
 class GitHubSync:
     def __init__(self):
         self.client = get_github_client()
@@ -17,6 +79,33 @@ class GitHubSync:
         self.community_repo = None  # Will be set dynamically
         self.contributors_file = "contributors/verified_contributors.json"
         self.requests_dir = "verification_requests"
+        self.tree_chunk_size = 100  # Tree entries per create_git_tree call
+        self._session = None
+        self._mirrors = {}
+    
+    @property
+    def session(self):
+        """Shared identity and repository cache for the current client"""
+        if self._session is None or self._session.client is not self.client:
+            self._session = GitHubSession(self.client) if self.client else None
+        return self._session
+    
+    def mirror_for(self, repo):
+        """Local git mirror for a repository, or None if the backend is off
+
+        Enabled with the git_mirror config key for the personal repository
+        and git_mirror_community for the community one.
+        """
+        config = ConfigManager()
+        community = self.community_repo and repo.full_name == self.community_repo
+        if not config.get("git_mirror_community" if community else "git_mirror", False):
+            return None
+        mirror = self._mirrors.get(repo.full_name)
+        if mirror is None:
+            from git_mirror import GitMirror
+            mirror = GitMirror(repo.clone_url, repo.full_name, token=config.get_github_token())
+            self._mirrors[repo.full_name] = mirror
+        return mirror
     
     def get_community_repo_input(self):
         """Get community repository name from user"""
@@ -53,9 +142,13 @@ class GitHubSync:
         if not self.community_repo:
             if not self.get_community_repo_input():
                 return None
+        
+        repo = self.session.cached_repo(self.community_repo)
+        if repo:
+            return repo
 
         try:
-            repo = self.client.get_repo(self.community_repo)
+            repo = self.session.get_repo(self.community_repo)
             console.print(f"[green]Found community repository: {repo.full_name}[/green]")
             return repo
         except GithubException as e:
@@ -97,7 +190,7 @@ class GitHubSync:
         try:
             # Extract owner and repo name
             owner, repo_name = self.community_repo.split("/")
-            current_user = self.client.get_user().login
+            current_user = self.session.login
             
             # Check if user can create in this owner
             if owner != current_user:
@@ -121,7 +214,7 @@ class GitHubSync:
                     return None
             
             # Create the repository
-            repo = self.client.get_user().create_repo(
+            repo = self.session.user.create_repo(
                 repo_name,
                 description="Community Java code examples for CodeLens",
                 private=False,
@@ -133,7 +226,7 @@ class GitHubSync:
             time.sleep(2)
             
             # Create contributors directory and file
-            initial_contributors = [self.client.get_user().login]
+            initial_contributors = [current_user]
             repo.create_file(
                 self.contributors_file,
                 "Initialize verified contributors",
@@ -147,7 +240,7 @@ class GitHubSync:
                 title="Community Setup Complete",
                 border_style="green"
             ))
-            return repo
+            return self.session.remember_repo(repo, self.community_repo)
             
         except Exception as create_error:
             console.print(f"[red]Failed to create community repo: {create_error}[/red]")
@@ -170,16 +263,15 @@ class GitHubSync:
         """Check if current user is verified contributor"""
         if not self.client:
             return False
-        user = self.client.get_user()
-        contributors = self.get_verified_contributors()
-        return user.login in contributors
+        contributors = self.session.contributors(self.get_verified_contributors)
+        return self.session.login in contributors
     
     def request_verification(self):
         """Submit verification request"""
         if not self.client:
             return False
             
-        user = self.client.get_user()
+        user = self.session.user
         repo = self.setup_community_repo()
         if not repo:
             return False
@@ -201,7 +293,7 @@ class GitHubSync:
             console.print(f"[red]Request failed: {e}[/red]")
             return False
     
-    def upload_to_community(self, file_path, category):
+    def upload_to_community(self, file_path, category, progress=NULL_PROGRESS):
         """Upload file to community repo (verified users only)"""
         if not self.is_verified_contributor():
             return False
@@ -211,27 +303,27 @@ class GitHubSync:
             return False
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'rb') as f:
                 content = f.read()
             
-            user = self.client.get_user()
+            user = self.session.user
             file_name = os.path.basename(file_path)
             
             # Add attribution
             attribution = f"// Contributor: {user.login}\n// Uploaded: {datetime.now().strftime('%Y-%m-%d')}\n\n"
-            content_with_attribution = attribution + content
+            body, content = content, attribution.encode("utf-8") + content
             
             repo_path = f"{category}/{file_name}"
             
-            repo.create_file(
-                repo_path,
-                f"Add {file_name} by {user.login}",
-                content_with_attribution,
-                branch="main"
-            )
+            remote_sha = self.remote_sha(repo, repo_path)
+            if self.same_community_body(repo, remote_sha, content, body):
+                log_to(progress, f"[bright_black]Unchanged, skipped: {repo_path}[/bright_black]")
+                return True
+            self.put_file(repo, repo_path, content, f"Add {file_name} by {user.login}", remote_sha)
+            get_blob_cache().put(git_blob_sha(content), content)
             return True
         except Exception as e:
-            console.print(f"[red]Community upload failed: {e}[/red]")
+            log_to(progress, f"[red]Community upload failed: {e}[/red]")
             return False
     
     def fetch_from_community(self, category=None):
@@ -241,101 +333,511 @@ class GitHubSync:
             return []
             
         try:
-            contents = repo.get_contents(category) if category else repo.get_contents("")
-            files = []
-            for content in contents:
-                # Skip contributor files
-                if "contributors" not in content.path and "verification_requests" not in content.path:
-                    files.append({
-                        "name": content.name,
-                        "path": content.path,
-                        "type": "file" if content.type == "file" else "dir"
-                    })
-            return files
+            # Skip contributor files
+            return [
+                entry for entry in self.filter_manifest(self.get_remote_manifest(repo), category)
+                if not entry["path"].startswith(("contributors/", "verification_requests/"))
+                and entry["path"] not in ("contributors", "verification_requests")
+            ]
         except Exception as e:
             console.print(f"[red]Failed to fetch community files: {e}[/red]")
             return []
     
+    def get_remote_manifest(self, repo, ref=None, progress=NULL_PROGRESS):
+        """List every entry of a repository with one recursive tree request
+
+        Returns dicts with path, name, type ("file"/"dir"), size and blob
+        SHA. Trees too large for a single response are walked level by
+        level instead.
+        """
+        mirror = self.mirror_for(repo) if ref is None else None
+        if mirror:
+            try:
+                mirror.fetch()
+                return mirror.manifest()
+            except Exception as e:
+                log_to(progress, f"[yellow]Git mirror unavailable, using the API: {e}[/yellow]")
+        
+        ref = ref or repo.default_branch
+        try:
+            tree = repo.get_git_tree(ref, recursive=True)
+        except GithubException as e:
+            if e.status in (404, 409):  # Empty repository
+                return []
+            raise
+        
+        if tree.raw_data.get("truncated"):
+            return list(self._walk_tree(repo, repo.get_git_tree(ref)))
+        return [
+            self._manifest_entry(element.path, element)
+            for element in tree.tree
+            if element.type in ("blob", "tree")
+        ]
+    
+    def _walk_tree(self, repo, tree, prefix=""):
+        """Walk a tree one level per request when recursive listing truncates"""
+        for element in tree.tree:
+            if element.type not in ("blob", "tree"):
+                continue
+            path = f"{prefix}{element.path}"
+            yield self._manifest_entry(path, element)
+            if element.type == "tree":
+                yield from self._walk_tree(repo, repo.get_git_tree(element.sha), f"{path}/")
+    
+    def _manifest_entry(self, path, element):
+        return {
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "type": "file" if element.type == "blob" else "dir",
+            "size": element.size if element.type == "blob" else 0,
+            "sha": element.sha
+        }
+    
+    def filter_manifest(self, manifest, category=None):
+        """Restrict a manifest to one category, naming entries relative to it"""
+        if not category:
+            return [dict(entry, name=entry["path"]) for entry in manifest]
+        
+        prefix = f"{category.strip('/')}/"
+        return [
+            dict(entry, name=entry["path"][len(prefix):])
+            for entry in manifest
+            if entry["path"].startswith(prefix)
+        ]
+    
     def setup_repo(self):
         """Setup personal repository"""
         if not self.client:
             return None
             
         try:
-            repo = self.client.get_user().get_repo(self.personal_repo)
-            return repo
+            full_name = f"{self.session.login}/{self.personal_repo}"
+            return self.session.get_repo(full_name)
         except GithubException as e:
             if e.status == 404:
                 try:
-                    repo = self.client.get_user().create_repo(
+                    repo = self.session.user.create_repo(
                         self.personal_repo,
                         description="CodeLens Java Learning Codes",
-                        private=False
+                        private=False,
+                        auto_init=True  # Git Data API needs an initial commit
                     )
-                    return repo
+                    return self.session.remember_repo(repo, full_name)
                 except GithubException:
                     return None
             return None
     
-    def upload_file(self, file_path, category):
-        """Upload file to personal repository"""
+    def upload_file(self, file_path, category, progress=NULL_PROGRESS):
+        """Upload file to personal repository
+
+        The local git blob SHA is compared with the repository first, so
+        an unchanged file costs no upload, and an existing file is
+        updated in place instead of failing.
+        """
         repo = self.setup_repo()
         if not repo:
             return False
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             file_name = os.path.basename(file_path)
             repo_path = f"{category}/{file_name}"
             
-            repo.create_file(
-                repo_path,
-                f"Add {file_name} via CodeLens",
-                content,
-                branch="main"
+            remote_sha = self.remote_sha(repo, repo_path)
+            if remote_sha == file_blob_sha(file_path):
+                log_to(progress, f"[bright_black]Unchanged, skipped: {repo_path}[/bright_black]")
+                return True
+            
+            if os.path.getsize(file_path) > LARGE_FILE_BYTES:
+                blob_sha = self.create_blob_streamed(repo, file_path)
+                self.commit_files(
+                    repo, {}, f"Add {file_name} via CodeLens", progress=progress, blobs={repo_path: blob_sha}
+                )
+            else:
+                with open(file_path, 'rb') as f:
+                    content = f.read()
+                self.put_file(repo, repo_path, content, f"Add {file_name} via CodeLens", remote_sha)
+            return True
+        except Exception as e:
+            log_to(progress, f"[red]Upload failed: {e}[/red]")
+            return False
+    
+    def remote_sha(self, repo, repo_path):
+        """Blob SHA of one repository file, or None if it doesn't exist
+
+        Read from the listing of the file's directory, which carries SHAs
+        but no content, so the cost is one request whatever the size of
+        the file or the repository. Batch uploads use remote_shas instead.
+        """
+        parent = repo_path.rpartition("/")[0]
+        try:
+            listing = repo.get_contents(parent, ref=repo.default_branch)
+        except GithubException as e:
+            if e.status == 404:
+                return None
+            raise
+        if not isinstance(listing, list):
+            return None  # The parent is a file
+        for entry in listing:
+            if entry.path == repo_path:
+                return entry.sha if entry.type == "file" else None
+        if len(listing) >= CONTENTS_LISTING_LIMIT:
+            # GitHub lists only the first entries of a huge directory
+            return self.remote_shas(repo).get(repo_path)
+        return None
+    
+    def remote_shas(self, repo, progress=NULL_PROGRESS):
+        """Map repository file paths to blob SHAs (one tree request)"""
+        return {
+            entry["path"]: entry["sha"]
+            for entry in self.get_remote_manifest(repo, progress=progress)
+            if entry["type"] == "file"
+        }
+    
+    def put_file(self, repo, repo_path, content, message, remote_sha=None):
+        """Create a file, or update it in place when it already exists"""
+        if remote_sha:
+            repo.update_file(
+                repo_path, message.replace("Add ", "Update ", 1), content, remote_sha,
+                branch=repo.default_branch
+            )
+        else:
+            repo.create_file(repo_path, message, content, branch=repo.default_branch)
+    
+    def create_blob_streamed(self, repo, file_path):
+        """Create a git blob from a file without loading it into memory"""
+        _, data = repo.requester.requestMemoryBlobAndCheck(
+            "POST", f"{repo.url}/git/blobs", None,
+            {"Content-Type": "application/json"}, StreamedBlobBody(file_path)
+        )
+        return data["sha"]
+    
+    def stage_upload(self, repo, files, category, progress=NULL_PROGRESS):
+        """Split files into (contents, blobs, skipped) for one commit
+
+        files is a list of (local_path, relative_name) pairs. Files whose
+        blob SHA matches the repository are skipped, large files are
+        streamed to the blobs API, and the rest are read for inline
+        upload.
+        """
+        remote = self.remote_shas(repo, progress)
+        contents = {}
+        blobs = {}
+        skipped = []
+        progress.start(len(files), "Comparing files")
+        for local_path, relative_name in files:
+            repo_path = f"{category}/{relative_name}"
+            size = os.path.getsize(local_path)
+            if remote.get(repo_path) == file_blob_sha(local_path):
+                skipped.append(repo_path)
+            elif size > LARGE_FILE_BYTES:
+                progress.update(f"Streaming {relative_name}")
+                blobs[repo_path] = self.create_blob_streamed(repo, local_path)
+            else:
+                with open(local_path, 'rb') as f:
+                    contents[repo_path] = f.read()
+            progress.advance(relative_name, size)
+        return contents, blobs, skipped
+    
+    def commit_files(self, repo, files, message, deletions=(), branch=None, progress=NULL_PROGRESS, blobs=None):
+        """Push many files as a single commit via the Git Data API
+
+        files maps repository paths to bytes; deletions lists repository
+        paths to remove; blobs maps paths to SHAs of blobs already
+        created (e.g. by create_blob_streamed). Text files travel inline
+        in the tree request, so the whole set costs a handful of requests
+        instead of one commit per file.
+        """
+        branch = branch or repo.default_branch
+        files = dict(files)
+        blobs = dict(blobs or {})
+        if not files and not deletions and not blobs:
+            return None
+        
+        mirror = self.mirror_for(repo) if not blobs else None
+        if mirror:
+            try:
+                progress.update("Pushing through git mirror")
+                login = self.session.login
+                return mirror.commit_and_push(
+                    files, message, deletions, branch,
+                    author=(login, f"{login}@users.noreply.github.com")
+                )
+            except Exception as e:
+                log_to(progress, f"[yellow]Git mirror push failed, using the API: {e}[/yellow]")
+        
+        try:
+            ref = repo.get_git_ref(f"heads/{branch}")
+        except GithubException as e:
+            if e.status not in (404, 409) or not files:
+                # An empty repo can't take pre-made blobs without a first file
+                raise
+            # Empty repository - the Git Data API only works once a first
+            # commit exists, so seed it through the contents API
+            first_path = next(iter(files))
+            repo.create_file(first_path, message, files.pop(first_path), branch=branch)
+            if not files and not deletions and not blobs:
+                return repo.get_git_ref(f"heads/{branch}").object.sha
+            ref = repo.get_git_ref(f"heads/{branch}")
+        
+        head_commit = repo.get_git_commit(ref.object.sha)
+        progress.update("Building tree")
+        elements = []
+        for repo_path, content in files.items():
+            try:
+                elements.append(InputGitTreeElement(
+                    repo_path, "100644", "blob", content=content.decode("utf-8")
+                ))
+            except UnicodeDecodeError:
+                blob = repo.create_git_blob(base64.b64encode(content).decode(), "base64")
+                elements.append(InputGitTreeElement(repo_path, "100644", "blob", sha=blob.sha))
+        for repo_path, blob_sha in blobs.items():
+            elements.append(InputGitTreeElement(repo_path, "100644", "blob", sha=blob_sha))
+        for repo_path in deletions:
+            elements.append(InputGitTreeElement(repo_path, "100644", "blob", sha=None))
+        
+        # Chain trees in chunks to keep each request body reasonably sized
+        tree = head_commit.tree
+        for start in range(0, len(elements), self.tree_chunk_size):
+            tree = repo.create_git_tree(elements[start:start + self.tree_chunk_size], base_tree=tree)
+        
+        progress.update("Creating commit")
+        commit = repo.create_git_commit(message, tree, [head_commit])
+        ref.edit(commit.sha)
+        return commit.sha
+    
+    def push_files(self, repo, files, category, progress=NULL_PROGRESS):
+        """Commit changed files to the personal repository; raises on failure
+
+        Returns (changed, skipped) counts. Unchanged files are skipped by
+        blob SHA, so pushing the same set again is a no-op.
+        """
+        contents, blobs, skipped = self.stage_upload(repo, files, category, progress)
+        changed = len(contents) + len(blobs)
+        if changed:
+            self.commit_files(
+                repo, contents, f"Add {changed} files to {category} via CodeLens",
+                progress=progress, blobs=blobs
+            )
+        return changed, len(skipped)
+    
+    def push_community_files(self, repo, files, category, progress=NULL_PROGRESS):
+        """Commit changed files with attribution to the community repo; raises on failure"""
+        user = self.session.user
+        attribution = f"// Contributor: {user.login}\n// Uploaded: {datetime.now().strftime('%Y-%m-%d')}\n\n"
+        remote = self.remote_shas(repo, progress)
+        progress.start(len(files), "Reading files")
+        contents = {}
+        for local_path, relative_name in files:
+            repo_path = f"{category}/{relative_name}"
+            with open(local_path, 'rb') as f:
+                body = f.read()
+            content = attribution.encode("utf-8") + body
+            if not self.same_community_body(repo, remote.get(repo_path), content, body):
+                contents[repo_path] = content
+            progress.advance(relative_name, len(content))
+        
+        if contents:
+            self.commit_files(
+                repo, contents, f"Add {len(contents)} files to {category} by {user.login}", progress=progress
             )
+            cache = get_blob_cache()
+            for content in contents.values():
+                cache.put(git_blob_sha(content), content)
+        return len(contents), len(files) - len(contents)
+
+    def same_community_body(self, repo, remote_sha, content, body):
+        """Whether the community file with remote_sha already holds body
+
+        The attribution header dates each upload, so an unchanged file gets
+        a new blob SHA every day. Unless the SHA matches outright, the
+        remote copy is compared without its header. Uploads are kept in the
+        blob cache, so usually no download is needed.
+        """
+        if remote_sha is None:
+            return False
+        if remote_sha == git_blob_sha(content):
+            return True
+        remote_content, _ = DownloadExecutor(repo, max_workers=1).fetch_content({"sha": remote_sha})
+        return strip_attribution(remote_content) == body
+    
+    def upload_files(self, files, category, progress=NULL_PROGRESS):
+        """Upload several files to the personal repository in one commit
+
+        files is a list of (local_path, relative_name) pairs; relative
+        names may contain sub-directories below the category.
+        """
+        repo = self.setup_repo()
+        if not repo:
+            return False
+        
+        try:
+            _, skipped = self.push_files(repo, files, category, progress)
+            if skipped:
+                log_to(progress, f"[bright_black]Skipped {skipped} unchanged files[/bright_black]")
+            return True
+        except Exception as e:
+            log_to(progress, f"[red]Upload failed: {e}[/red]")
+            return False
+    
+    def upload_files_to_community(self, files, category, progress=NULL_PROGRESS):
+        """Upload several files to the community repo in one commit"""
+        if not self.is_verified_contributor():
+            return False
+        
+        repo = self.setup_community_repo()
+        if not repo:
+            return False
+        
+        try:
+            _, skipped = self.push_community_files(repo, files, category, progress)
+            if skipped:
+                log_to(progress, f"[bright_black]Skipped {skipped} unchanged files[/bright_black]")
             return True
         except Exception as e:
-            print(f"Upload error: {e}")
+            log_to(progress, f"[red]Community upload failed: {e}[/red]")
             return False
     
     def list_remote_files(self, category=None):
-        """List files from personal repository"""
+        """List files from personal repository, including nested folders"""
         repo = self.setup_repo()
         if not repo:
             return []
             
         try:
-            contents = repo.get_contents(category) if category else repo.get_contents("")
-            files = []
-            for content in contents:
-                files.append({
-                    "name": content.name,
-                    "path": content.path,
-                    "type": "file" if content.type == "file" else "dir"
-                })
-            return files
+            return self.filter_manifest(self.get_remote_manifest(repo), category)
         except:
             return []
     
-    def download_file(self, remote_path, local_path):
-        """Download a file from GitHub to local storage"""
+    def download_file(self, remote_path, local_path, sha=None, progress=NULL_PROGRESS):
+        """Download a file from GitHub to local storage
+
+        When the blob SHA is known (e.g. from list_remote_files) the local
+        blob cache is checked before any network request.
+        """
+        cache = get_blob_cache()
+        content = cache.get(sha)
+        if content is not None:
+            atomic_write(local_path, content)
+            log_to(progress, f"[green]Downloaded: {remote_path} (cached)[/green]")
+            return True
+        
         repo = self.setup_repo()
         if not repo:
             return False
             
         try:
             file_content = repo.get_contents(remote_path)
-            local_path = Path(local_path)
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(local_path, 'w', encoding='utf-8') as f:
-                f.write(file_content.decoded_content.decode())
+            cache.put(file_content.sha, file_content.decoded_content)
+            atomic_write(local_path, file_content.decoded_content)
             
-            console.print(f"[green]Downloaded: {remote_path}[/green]")
+            log_to(progress, f"[green]Downloaded: {remote_path}[/green]")
             return True
         except Exception as e:
-            console.print(f"[red]Download failed: {e}[/red]")
-            return False
\ No newline at end of file
+            log_to(progress, f"[red]Download failed: {e}[/red]")
+            return False
+    
+    def download_files(self, items, repo=None, on_result=None, max_workers=None, progress=NULL_PROGRESS):
+        """Download many files concurrently from one repository
+
+        items are dicts with remote_path, local_path and optional sha. The
+        personal repository is used unless another repo handle is given.
+        """
+        repo = repo or self.setup_repo()
+        if not repo:
+            return []
+        executor = DownloadExecutor(repo, max_workers, mirror=self.mirror_for(repo))
+        return executor.download(items, on_result, progress)
+    
+    def remote_categories(self, manifest, exclude=()):
+        """Top-level directories of a manifest, i.e. its categories"""
+        return sorted(
+            entry["path"] for entry in manifest
+            if entry["type"] == "dir" and "/" not in entry["path"] and entry["path"] not in exclude
+        )
+    
+    def fetch_archive(self, repo, categories=None, exclude=(), manifest=None, local_root="java_files",
+                      on_result=None, progress=NULL_PROGRESS):
+        """Mirror whole categories from one streamed tarball of the repo
+
+        Files whose local copy already matches the manifest SHA are
+        skipped, and if nothing changed no archive is requested at all.
+        The tarball is read as a stream, so only one member is held in
+        memory at a time. Anything the archive could not provide falls
+        back to the regular per-file download.
+        """
+        if manifest is None:
+            manifest = self.get_remote_manifest(repo, progress=progress)
+        local_root = Path(local_root)
+        wanted = {}
+        for entry in manifest:
+            top = entry["path"].split("/", 1)[0]
+            if entry["type"] != "file" or "/" not in entry["path"] or top in exclude:
+                continue
+            if categories is None or top in categories:
+                target = safe_join(local_root, entry["path"])
+                if target is not None:
+                    wanted[entry["path"]] = (entry["sha"], target)
+        
+        results = []
+        def report(path, ok, size=0, source=None, error=None):
+            sha, target = wanted[path]
+            result = {
+                "item": {"remote_path": path, "local_path": target, "sha": sha},
+                "ok": ok, "bytes": size, "source": source, "error": error
+            }
+            results.append(result)
+            progress.advance(path, size)
+            if on_result:
+                on_result(result)
+        
+        progress.start(len(wanted), f"Mirroring {len(wanted)} files")
+        pending = {}
+        for path, (sha, target) in wanted.items():
+            if target.is_file() and file_blob_sha(target) == sha:
+                report(path, True, source="local")
+            else:
+                pending[path] = sha
+        
+        if pending:
+            cache = get_blob_cache()
+            try:
+                progress.update(f"Streaming archive for {len(pending)} files")
+                url = repo.get_archive_link("tarball", repo.default_branch)
+                started = time.perf_counter()
+                with get_http_session().get(url, stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                        for member in archive:
+                            # Members are "<owner>-<repo>-<sha>/<path>"
+                            path = member.name.split("/", 1)[1] if "/" in member.name else None
+                            if not member.isfile() or path not in pending:
+                                continue
+                            data = archive.extractfile(member).read()
+                            if git_blob_sha(data) != pending[path]:
+                                continue  # e.g. export-subst; refetch the exact blob below
+                            atomic_write(wanted[path][1], data)
+                            cache.put(pending.pop(path), data)
+                            report(path, True, len(data), "archive")
+                    # The archive bypasses the transport middleware, so count it here
+                    get_metrics().record(
+                        response.status_code, (time.perf_counter() - started) * 1000,
+                        received=response.raw.tell()
+                    )
+            except JobCancelled:
+                raise
+            except Exception as e:
+                log_to(progress, f"[yellow]Archive download failed, fetching files individually: {e}[/yellow]")
+        
+        if pending:
+            items = [
+                {"remote_path": path, "local_path": wanted[path][1], "sha": sha}
+                for path, sha in pending.items()
+            ]
+            def collect(result):
+                results.append(result)
+                if on_result:
+                    on_result(result)
+            # The executor reports progress for these itself
+            executor = DownloadExecutor(repo, mirror=self.mirror_for(repo))
+            executor.download(items, collect, progress)
+        return results
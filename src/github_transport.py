@@ -0,0 +1,109 @@
+import threading
+import requests
+import requests.adapters
+from github.Requester import Requester, RequestsResponse
+
+DEFAULT_POOL_SIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+_middlewares = []
+
+def add_middleware(middleware, outermost=False):
+    """Wrap every GitHub request sent through the pooled transport
+
+    middleware(request, send) receives a request dict (verb, url, headers,
+    data, stream) and the next handler, and returns a response object with
+    status, headers, getheaders() and read().
+    """
+    if middleware in _middlewares:
+        return
+    if outermost:
+        _middlewares.insert(0, middleware)
+    else:
+        _middlewares.append(middleware)
+
+def get_http_session(pool_size=None, retry=None):
+    """Return the process-wide keep-alive session used for GitHub calls"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # A non-None auth stops requests from falling back to ~/.netrc
+            session.auth = Requester.noopAuth
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=retry if retry is not None else requests.adapters.DEFAULT_RETRIES,
+                pool_connections=pool_size or DEFAULT_POOL_SIZE,
+                pool_maxsize=pool_size or DEFAULT_POOL_SIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+class PooledHTTPSConnection:
+    """httplib-style connection PyGithub can use from many threads
+
+    PyGithub's stock connection keeps the pending request on a single
+    shared object, so two threads using one client can swap requests.
+    Injected connection classes are created per request instead, and all
+    of them send through one pooled requests.Session.
+    """
+
+    protocol = "https"
+    default_port = 443
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else self.default_port
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.session = get_http_session(pool_size, retry)
+
+    def request(self, verb, url, input, headers, stream=False):
+        self.verb = verb
+        self.url = url
+        self.input = input
+        self.headers = headers
+        self.stream = stream
+
+    def getresponse(self):
+        request = {
+            "verb": self.verb,
+            "url": f"{self.protocol}://{self.host}:{self.port}{self.url}",
+            "headers": dict(self.headers or {}),
+            "data": self.input,
+            "stream": self.stream
+        }
+        
+        return self._dispatch(request, 0)
+
+    def _dispatch(self, request, index):
+        if index == len(_middlewares):
+            return self.send(request)
+        return _middlewares[index](request, lambda req: self._dispatch(req, index + 1))
+
+    def send(self, request):
+        response = self.session.request(
+            request["verb"],
+            request["url"],
+            headers=request["headers"],
+            data=request["data"],
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+            stream=request["stream"]
+        )
+        return RequestsResponse(response)
+
+    def close(self):
+        # The shared session outlives individual requests
+        pass
+
+class PooledHTTPConnection(PooledHTTPSConnection):
+    protocol = "http"
+    default_port = 80
+
+def install_transport():
+    """Route every PyGithub request through the pooled connections"""
+    Requester.injectConnectionClasses(PooledHTTPConnection, PooledHTTPSConnection)
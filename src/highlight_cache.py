@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from rich.style import Style
+from rich.text import Text
+from config_manager import ConfigManager
+from fs_utils import atomic_write, git_blob_sha
+
+HIGHLIGHT_SUFFIXES = (".java",)
+MAX_TOKENIZE_BYTES = 8 * 1024 * 1024
+MEMORY_ENTRIES = 32
+DEFAULT_WORKERS = 2
+THEME = "monokai"
+
+class TokenLines:
+    """Compact per-line token runs for one file
+
+    Each run is a (token type index, length) pair; the text itself is
+    not stored, since the caller always has it. Runs are split at line
+    breaks so any single line can be styled on its own.
+    """
+
+    __slots__ = ("types", "runs", "line_starts")
+
+    def __init__(self, types, runs, line_starts):
+        self.types = types              # token type names, e.g. "Token.Keyword"
+        self.runs = runs                # array('I'): type, length, type, length...
+        self.line_starts = line_starts  # array('I'): run index where each line starts
+
+    def __len__(self):
+        return len(self.line_starts) - 1
+
+    def line_runs(self, line):
+        """(type name, length) pairs for a 0-based line"""
+        start, end = self.line_starts[line], self.line_starts[line + 1]
+        return [(self.types[self.runs[2 * i]], self.runs[2 * i + 1]) for i in range(start, end)]
+
+    def to_bytes(self):
+        header = json.dumps({"types": self.types, "lines": len(self.line_starts)}).encode("utf-8")
+        return header + b"\n" + self.line_starts.tobytes() + self.runs.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        header, body = data.split(b"\n", 1)
+        header = json.loads(header)
+        line_starts = array('I')
+        split = header["lines"] * line_starts.itemsize
+        line_starts.frombytes(body[:split])
+        runs = array('I')
+        runs.frombytes(body[split:])
+        if len(line_starts) != header["lines"] or line_starts[-1] * 2 != len(runs):
+            raise ValueError("corrupt token cache entry")
+        return cls(header["types"], runs, line_starts)
+
+def tokenize(text):
+    """Lex Java source into TokenLines"""
+    from pygments.lexers import JavaLexer
+    lexer = JavaLexer(stripnl=False, ensurenl=False)
+    types = []
+    type_ids = {}
+    runs = array('I')
+    line_starts = array('I', [0])
+    for ttype, value in lexer.get_tokens(text):
+        type_id = type_ids.get(ttype)
+        if type_id is None:
+            type_id = type_ids[ttype] = len(types)
+            types.append(str(ttype))
+        pieces = value.split("\n")
+        for number, piece in enumerate(pieces):
+            if number:
+                line_starts.append(len(runs) // 2)
+            if piece:
+                runs.append(type_id)
+                runs.append(len(piece))
+    line_starts.append(len(runs) // 2)
+    return TokenLines(types, runs, line_starts)
+
+class TokenCache:
+    """Syntax-highlighting tokens keyed by content hash
+
+    Entries are kept in a small in-memory LRU and on disk under
+    ~/.codelens/token_cache, so a file is lexed once per content
+    version. prewarm() lexes files on a background pool ahead of the
+    user opening them.
+    """
+
+    def __init__(self, cache_dir=None, memory_entries=MEMORY_ENTRIES, workers=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".codelens" / "token_cache"
+        if workers is None:
+            workers = ConfigManager().get("highlight_workers", DEFAULT_WORKERS)
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.signatures = {}  # path -> ((mtime_ns, size), sha) of the last read
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="highlight")
+        self.styles = {}
+
+    @staticmethod
+    def supports(path):
+        return str(path).endswith(HIGHLIGHT_SUFFIXES)
+
+    def _entry_path(self, sha):
+        return self.cache_dir / sha[:2] / sha[2:]
+
+    def _remember(self, sha, tokens):
+        with self.lock:
+            self.memory[sha] = tokens
+            self.memory.move_to_end(sha)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def _cached(self, sha):
+        """Tokens from memory or disk, or None"""
+        with self.lock:
+            tokens = self.memory.get(sha)
+            if tokens is not None:
+                self.memory.move_to_end(sha)
+                return tokens
+        try:
+            with open(self._entry_path(sha), 'rb') as f:
+                tokens = TokenLines.from_bytes(f.read())
+        except (OSError, ValueError):
+            return None
+        self._remember(sha, tokens)
+        return tokens
+
+    def _signature(self, path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get_for_text(self, text, sha=None):
+        """Tokens for in-memory source, lexing and storing on a miss"""
+        sha = sha or git_blob_sha(text)
+        tokens = self._cached(sha)
+        if tokens is None:
+            tokens = tokenize(text)
+            self._remember(sha, tokens)
+            try:
+                atomic_write(self._entry_path(sha), tokens.to_bytes())
+            except OSError:
+                pass  # The cache is an optimization only
+        return tokens
+
+    def get(self, path, text=None):
+        """Tokens for a file; text may be passed if already read"""
+        path = os.path.abspath(path)
+        signature = self._signature(path)
+        if text is None:
+            if signature[1] > MAX_TOKENIZE_BYTES:
+                return None
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        sha = git_blob_sha(text)
+        tokens = self.get_for_text(text, sha)
+        with self.lock:
+            self.signatures[path] = (signature, sha)
+        return tokens
+
+    def lookup(self, path):
+        """Tokens for a file only if already cached; never reads the file
+
+        Relies on the content hash recorded when the file was last
+        tokenized in this session, so it is safe to call on huge files.
+        """
+        path = os.path.abspath(path)
+        with self.lock:
+            known = self.signatures.get(path)
+        try:
+            if not known or known[0] != self._signature(path):
+                return None
+        except OSError:
+            return None
+        return self._cached(known[1])
+
+    def _prewarm_one(self, path):
+        try:
+            if self.lookup(path) is None:
+                self.get(path)
+        except Exception:
+            pass  # Viewing will retry and report real errors
+        finally:
+            with self.lock:
+                self.pending.discard(path)
+
+    def prewarm(self, paths):
+        """Tokenize files in the background ahead of viewing"""
+        for path in paths:
+            path = os.path.abspath(path)
+            if not self.supports(path):
+                continue
+            with self.lock:
+                if path in self.pending:
+                    continue
+                self.pending.add(path)
+            self.executor.submit(self._prewarm_one, path)
+
+    def style_for(self, type_name):
+        """Rich style for a pygments token type name (foreground only)"""
+        style = self.styles.get(type_name)
+        if style is None:
+            from pygments.styles import get_style_by_name
+            from pygments.token import string_to_tokentype
+            pygments_style = get_style_by_name(THEME).style_for_token(string_to_tokentype(type_name))
+            style = Style(
+                color=f"#{pygments_style['color']}" if pygments_style["color"] else None,
+                bold=pygments_style["bold"] or None,
+                italic=pygments_style["italic"] or None
+            )
+            self.styles[type_name] = style
+        return style
+
+    def render_line(self, tokens, line, text):
+        """Styled Text for one line, or plain text if tokens don't match"""
+        if tokens is None or line >= len(tokens):
+            return Text(text)
+        runs = tokens.line_runs(line)
+        if sum(length for _, length in runs) != len(text):
+            return Text(text)
+        styled = Text()
+        position = 0
+        for type_name, length in runs:
+            styled.append(text[position:position + length], style=self.style_for(type_name))
+            position += length
+        return styled
+
+_token_cache = None
+
+def get_token_cache():
+    """Process-wide token cache"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenCache()
+    return _token_cache
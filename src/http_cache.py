@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from fs_utils import atomic_write
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MAX_ENTRY_BYTES = 1024 * 1024
+
+# Rate-limit headers on a 304 are fresh and must not be replaced by stale ones
+FRESH_HEADERS = ("x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset",
+                 "x-ratelimit-used", "x-ratelimit-resource", "date")
+
+class CachedResponse:
+    """Response served from the HTTP cache after a 304 Not Modified"""
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.body
+
+    def iter_content(self, chunk_size=1):
+        data = self.body.encode("utf-8")
+        for start in range(0, len(data), chunk_size or len(data) or 1):
+            yield data[start:start + (chunk_size or len(data))]
+
+    def raise_for_status(self):
+        pass
+
+class HttpCache:
+    """Disk-backed conditional request cache for GitHub API reads
+
+    Successful GET responses carrying an ETag or Last-Modified header are
+    stored under ~/.codelens/http_cache. Repeated reads are sent as
+    conditional requests, and a 304 is answered from disk. GitHub does
+    not charge 304 responses against the rate limit.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".codelens" / "http_cache"
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def _key(self, request):
+        headers = {k.lower(): v for k, v in request["headers"].items()}
+        # Different tokens may see different data for the same URL
+        identity = hashlib.sha256(headers.get("authorization", "").encode()).hexdigest()
+        raw = "\n".join([request["url"], headers.get("accept", ""), identity])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key[2:]}.json"
+
+    def load(self, key):
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, response, body):
+        headers = {k.lower(): v for k, v in response.getheaders()}
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not (etag or last_modified) or len(body) > MAX_ENTRY_BYTES:
+            return
+        
+        entry = {
+            "status": response.status,
+            "headers": headers,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body
+        }
+        data = json.dumps(entry)
+        try:
+            atomic_write(self._entry_path(key), data)
+        except OSError:
+            return
+        self._maybe_evict(len(data))
+
+    def middleware(self, request, send):
+        """Transport middleware adding conditional headers to GET requests"""
+        if request["verb"] != "GET" or request["stream"]:
+            return send(request)
+        
+        key = self._key(request)
+        entry = self.load(key)
+        if entry:
+            if entry.get("etag"):
+                request["headers"]["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request["headers"]["If-Modified-Since"] = entry["last_modified"]
+        
+        response = send(request)
+        
+        if response.status == 304 and entry:
+            with self.lock:
+                self.hits += 1
+            headers = dict(entry["headers"])
+            for name, value in response.getheaders():
+                if name.lower() in FRESH_HEADERS:
+                    headers[name.lower()] = value
+            return CachedResponse(entry["status"], headers, entry["body"])
+        
+        with self.lock:
+            self.misses += 1
+        if response.status == 200:
+            self.store(key, response, response.read())
+        return response
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _maybe_evict(self, added):
+        """Drop the oldest entries once the cache outgrows its budget"""
+        with self.lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += added
+            if self._size <= self.max_bytes:
+                return
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._size = total
+
+_http_cache = None
+
+def get_http_cache():
+    """Return the shared HTTP cache for this process"""
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
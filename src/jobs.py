@@ -0,0 +1,172 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api_metrics import get_metrics
+from config_manager import ConfigManager
+from progress import ProgressReporter
+
+DEFAULT_JOB_WORKERS = 2
+MAX_LOG_LINES = 200
+
+class JobCancelled(Exception):
+    """Raised inside a job's work when the user cancelled it"""
+
+class Job(ProgressReporter):
+    """Handle for one background operation
+
+    The job is the operation's progress reporter: progress events update
+    its state for the 'jobs' command, log() keeps messages that would
+    otherwise be printed, and each event is a cancellation point, so work
+    that reports progress can be cancelled between items.
+    """
+
+    def __init__(self, job_id, name, command=None):
+        self.id = job_id
+        self.name = name
+        self.command = command  # API requests are counted against it
+        self.status = "queued"
+        self.description = name
+        self.total = None
+        self.done = 0
+        self.bytes = 0
+        self.item = ""
+        self.result = None
+        self.error = None
+        self.messages = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+        self.future = None
+        self.lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def check_cancelled(self):
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+
+    def start(self, total=None, description=None):
+        with self.lock:
+            self.total = total
+            self.done = 0
+            self.bytes = 0
+            self.item = ""
+            if description:
+                self.description = description
+        self.check_cancelled()
+
+    def update(self, description):
+        with self.lock:
+            self.description = description
+        self.check_cancelled()
+
+    def advance(self, item=None, nbytes=0, count=1):
+        with self.lock:
+            self.done += count
+            self.bytes += nbytes
+            self.item = item or ""
+        self.check_cancelled()
+
+    def log(self, message):
+        with self.lock:
+            self.messages.append(message)
+            del self.messages[:-MAX_LOG_LINES]
+
+    def cancel(self):
+        """Ask the job to stop; a job that hasn't started never runs"""
+        self.cancel_requested.set()
+        if self.future is not None and self.future.cancel():
+            self._finish("cancelled")
+
+    def _finish(self, status, result=None, error=None):
+        with self.lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+
+    def run(self, work):
+        if self.cancel_requested.is_set():
+            self._finish("cancelled")
+            return
+        with self.lock:
+            self.status = "running"
+            self.started_at = time.time()
+        try:
+            with get_metrics().attribute(self.command):
+                result = work(self)
+        except JobCancelled:
+            self._finish("cancelled")
+        except Exception as e:
+            self._finish("failed", error=str(e))
+        else:
+            self._finish("done", result=result)
+
+class JobManager:
+    """Runs long operations on a small pool while the REPL stays usable
+
+    submit() takes work(progress) - a callable receiving the Job as its
+    progress reporter - and returns the Job at once. Prompts belong in
+    the foreground: collect the user's choices first, then submit the
+    transfer.
+    """
+
+    def __init__(self, max_workers=None):
+        if max_workers is None:
+            max_workers = ConfigManager().get("job_workers", DEFAULT_JOB_WORKERS)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="job")
+        self.jobs = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def submit(self, name, work):
+        with self.lock:
+            job = Job(next(self.ids), name, get_metrics().current)
+            self.jobs[job.id] = job
+        job.future = self.executor.submit(job.run, work)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def active(self):
+        return [job for job in self.list() if job.active]
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job.cancel()
+        return True
+
+    def cancel_all(self):
+        for job in self.active():
+            job.cancel()
+
+    def clear_finished(self):
+        with self.lock:
+            for job_id in [job_id for job_id, job in self.jobs.items() if not job.active]:
+                del self.jobs[job_id]
+
+_job_manager = None
+
+def get_job_manager():
+    """Process-wide job manager"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
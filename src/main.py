@@ -1,18 +1,9 @@
 #!/usr/bin/env python3
+import time
+_STARTED_AT = time.perf_counter()
+
 import os
 import sys
-from rich.console import Console
-from rich.text import Text
-from rich.panel import Panel
-from rich.table import Table
-from rich import box
-from rich.progress import Progress
-import time
-import questionary
-from pathlib import Path
-import getpass
-from file_manager import FileManager
-from github_sync import GitHubSync
 
 # Add src to path for both development and PyInstaller
 if getattr(sys, 'frozen', False):
@@ -24,12 +15,56 @@ else:
 
 sys.path.insert(0, application_path)
 
-file_manager = FileManager()
+from rich.console import Console
+from rich.text import Text
+from rich.panel import Panel
+from rich.table import Table
+from rich import box
+from pathlib import Path
+import getpass
+import glob
+from rate_limiter import get_scheduler
+from progress import RichProgressReporter, format_bytes
+from api_metrics import get_metrics
+
+# Heavy subsystems (PyGithub, watchdog, questionary) load on first use
+_file_manager = None
+_github_sync = None
+_search_index = None
 console = Console()
 username = getpass.getuser()
-github_sync = GitHubSync()
 
 VERSION = "1.0.0"
+PAGER_THRESHOLD = 64 * 1024  # bytes; larger files open in the pager
+
+def get_file_manager():
+    """Create the file manager (and its watchdog observer) on first use"""
+    global _file_manager
+    if _file_manager is None:
+        from file_manager import FileManager
+        _file_manager = FileManager()
+    return _file_manager
+
+def get_github_sync():
+    """Create the GitHub client and sync layer on first use"""
+    global _github_sync
+    if _github_sync is None:
+        from github_sync import GitHubSync
+        _github_sync = GitHubSync()
+    return _github_sync
+
+def get_search_index():
+    """Open the search index and keep it current from file events"""
+    global _search_index
+    if _search_index is None:
+        from search_index import SearchIndex
+        file_manager = get_file_manager()
+        _search_index = SearchIndex(file_manager.base_path)
+        file_manager.add_listener(_search_index.on_event)
+        # Catch up on edits made while CodeLens was not running
+        with RichProgressReporter("Updating search index", console=console) as progress:
+            _search_index.refresh(progress=progress)
+    return _search_index
 
 def linux_prompt():
     prompt = Text()
@@ -37,13 +72,6 @@ def linux_prompt():
     prompt.append(":~$ ", style="bold white")
     console.print(prompt, end="")
 
-def loading_screen(task_name, duration=3):
-    with Progress() as progress:
-        task = progress.add_task(f"[cyan]{task_name}", total=duration)
-        while not progress.finished:
-            progress.update(task, advance=0.1)
-            time.sleep(0.1)
-
 def display_header():
     from config_manager import ConfigManager
     config = ConfigManager()
@@ -53,8 +81,29 @@ def display_header():
     else:
         auth_status = "[yellow]RUN 'auth' TO SETUP GITHUB SYNC[/yellow]"
     
+    quota = get_scheduler().quota()
+    if quota:
+        remaining, limit, reset = quota
+        style = "green" if remaining > limit * 0.1 else "red"
+        auth_status += f" | [{style}]API {remaining}/{limit}[/{style}]"
+    
+    if "jobs" in sys.modules:  # Only once a job has been started
+        from jobs import get_job_manager
+        running = len(get_job_manager().active())
+        if running:
+            auth_status += f" | [cyan]JOBS RUNNING: {running}[/cyan]"
+    
+    from upload_queue import pending_uploads
+    pending, retrying, failed = pending_uploads()
+    if pending:
+        auth_status += f" | [yellow]UPLOADS QUEUED: {pending}[/yellow]"
+        if retrying:
+            auth_status += f" [red]({retrying} retrying)[/red]"
+    if failed:
+        auth_status += f" | [red]UPLOADS FAILED: {failed} - see 'queue'[/red]"
+    
     header = Panel(
-        Text(f"CODE-LENS v{VERSION} | {auth_status}", style="bold cyan"),
+        Text.from_markup(f"CODE-LENS v{VERSION} | {auth_status}", style="bold cyan"),
         box=box.DOUBLE,
         border_style="bright_blue"
     )
@@ -73,12 +122,19 @@ def show_menu():
     commands = [
         ("auth", "Setup GitHub authentication"),
         ("browse", "Browse local Java files"),
+        ("search", "Search classes, methods and comments"),
         ("upload", "Upload to personal repo"),
         ("upload-community", "Upload to community"),
         ("fetch", "Download from personal repo"),
+        ("fetch --all", "Mirror whole categories from personal repo"),
         ("fetch-community", "Download from community"),
+        ("fetch-community --all", "Mirror whole community categories"),
         ("verify-me", "Request contributor access"),
         ("sync", "Sync local with GitHub"),
+        ("watch", "Auto-push saved files"),
+        ("jobs", "Background transfers: progress, results, cancel"),
+        ("queue", "Queued uploads: errors, retry or drop failed"),
+        ("stats", "GitHub API usage per command"),
         ("settings", "Application settings"),
         ("exit", "Quit application")
     ]
@@ -88,7 +144,56 @@ def show_menu():
     
     console.print(menu_table)
 
+def collect_upload_files(path_input):
+    """Expand a file, folder or glob pattern into (path, relative name) pairs"""
+    path = Path(path_input).expanduser()
+    
+    if path.is_file():
+        return [(path, path.name)]
+    
+    if path.is_dir():
+        return [
+            (item, item.relative_to(path).as_posix())
+            for item in sorted(path.rglob("*"))
+            if item.is_file() and not any(part.startswith('.') for part in item.relative_to(path).parts)
+        ]
+    
+    matches = [Path(match) for match in sorted(glob.glob(str(path), recursive=True))]
+    # Names keep the folders below the pattern's fixed prefix, so two
+    # Main.java matched by loops/**/*.java don't collapse into one
+    fixed = []
+    for part in path.parts:
+        if glob.has_magic(part):
+            break
+        fixed.append(part)
+    root = Path(*fixed) if fixed else Path(".")
+    return [(match, match.relative_to(root).as_posix()) for match in matches if match.is_file()]
+
+def queue_uploads(files, category, community_repo=None):
+    """Hand uploads to the background queue; False if queuing is disabled"""
+    from config_manager import ConfigManager
+    if not ConfigManager().get("upload_queue", True):
+        return False
+    from upload_queue import get_upload_queue, PERSONAL
+    queue = get_upload_queue()
+    queue.enqueue(files, category, community_repo or PERSONAL)
+    queue.start(get_github_sync())
+    
+    target = f"community/{category}" if community_repo else f"GitHub/{category}"
+    message = (
+        f"[green]{len(files)} file(s) queued for {target}/[/green]\n"
+        "They are pushed in the background and kept until the push succeeds."
+    )
+    error = queue.last_error()
+    if error:
+        message += f"\n[yellow]Earlier uploads are waiting to retry: {error}[/yellow]"
+    console.print(Panel(message, title="Upload Queued", border_style="green"))
+    return True
+
 def upload_file():
+    import questionary
+    github_sync = get_github_sync()
+    
     if not github_sync.client:
         console.print(Panel(
             "[red]Please setup GitHub authentication first using 'auth' command[/red]",
@@ -98,9 +203,13 @@ def upload_file():
         input("Press Enter to continue...")
         return
     
-    file_path = questionary.path("Enter file path:").ask()
+    file_path = questionary.path(
+        "Enter file, folder or glob pattern:",
+        instruction="(e.g. Loops.java, loops/ or loops/*.java)"
+    ).ask()
+    files = collect_upload_files(file_path) if file_path else []
     
-    if file_path and Path(file_path).exists():
+    if files:
         category = questionary.text(
             "Enter category name:",
             instruction="(creates directory if new)"
@@ -110,10 +219,19 @@ def upload_file():
             category_path = Path("java_files") / category
             category_path.mkdir(exist_ok=True)
             
-            loading_screen(f"Uploading to {category}", 3)
-            if github_sync.upload_file(file_path, category):
+            if queue_uploads(files, category):
+                input("Press Enter to continue...")
+                return
+            
+            with RichProgressReporter(f"Uploading {len(files)} files to {category}", console) as progress:
+                if len(files) == 1:
+                    uploaded = github_sync.upload_file(files[0][0], category, progress=progress)
+                else:
+                    uploaded = github_sync.upload_files(files, category, progress=progress)
+            
+            if uploaded:
                 console.print(Panel(
-                    f"[green]File successfully uploaded to GitHub/{category}/[/green]",
+                    f"[green]{len(files)} file(s) successfully uploaded to GitHub/{category}/[/green]",
                     title="Upload Successful",
                     border_style="green"
                 ))
@@ -134,6 +252,9 @@ def upload_file():
 
 def upload_to_community():
     """Upload file to community repository"""
+    import questionary
+    github_sync = get_github_sync()
+    
     if not github_sync.client:
         console.print(Panel(
             "[red]Please setup GitHub authentication first using 'auth' command[/red]",
@@ -155,19 +276,32 @@ def upload_to_community():
         input("Press Enter to continue...")
         return
     
-    file_path = questionary.path("Enter file path:").ask()
+    file_path = questionary.path(
+        "Enter file, folder or glob pattern:",
+        instruction="(e.g. Loops.java, loops/ or loops/*.java)"
+    ).ask()
+    files = collect_upload_files(file_path) if file_path else []
     
-    if file_path and Path(file_path).exists():
+    if files:
         category = questionary.text(
             "Enter category name:",
             instruction="(will be created in community repo)"
         ).ask()
         
         if category:
-            loading_screen(f"Uploading to community/{category}", 3)
-            if github_sync.upload_to_community(file_path, category):
+            if queue_uploads(files, category, github_sync.community_repo):
+                input("Press Enter to continue...")
+                return
+            
+            with RichProgressReporter(f"Uploading {len(files)} files to community/{category}", console) as progress:
+                if len(files) == 1:
+                    uploaded = github_sync.upload_to_community(files[0][0], category, progress=progress)
+                else:
+                    uploaded = github_sync.upload_files_to_community(files, category, progress=progress)
+            
+            if uploaded:
                 console.print(Panel(
-                    f"[green]File successfully uploaded to community/{category}/[/green]\n"
+                    f"[green]{len(files)} file(s) successfully uploaded to community/{category}/[/green]\n"
                     f"Thank you for contributing to the community!",
                     title="Community Upload Successful",
                     border_style="green"
@@ -187,7 +321,44 @@ def upload_to_community():
     
     input("Press Enter to continue...")
 
+def report_download(result, log=None):
+    """Print (or log to a job) the outcome of a single file download"""
+    log = log or console.print
+    name = result["item"]["remote_path"]
+    if result["ok"] and result["source"] == "local":
+        log(f"[bright_black]Up to date: {name}[/bright_black]")
+    elif result["ok"]:
+        suffix = " (cached)" if result["source"] == "cache" else ""
+        log(f"[green]Downloaded: {name}{suffix}[/green]")
+    else:
+        log(f"[red]Failed to download {name}: {result['error']}[/red]")
+
+def run_job(name, work, title):
+    """Run work(progress) as a background job, or here if jobs are disabled
+
+    work returns a summary (Rich markup) shown when it finishes. Prompts
+    must happen before this call; the work itself never asks anything.
+    """
+    from config_manager import ConfigManager
+    if not ConfigManager().get("background_jobs", True):
+        with RichProgressReporter(name, console) as progress:
+            summary = work(progress)
+        console.print(Panel(summary, title=title, border_style="green"))
+        return
+    
+    from jobs import get_job_manager
+    job = get_job_manager().submit(name, work)
+    console.print(Panel(
+        f"[green]Started job #{job.id}: {name}[/green]\n"
+        "Keep working - use 'jobs' to follow its progress or cancel it.",
+        title="Running In Background",
+        border_style="green"
+    ))
+
 def fetch_files():
+    import questionary
+    github_sync = get_github_sync()
+    
     if not github_sync.client:
         console.print(Panel(
             "[red]Please setup GitHub authentication first using 'auth' command[/red]",
@@ -208,30 +379,34 @@ def fetch_files():
     category_path = Path("java_files") / category
     category_path.mkdir(exist_ok=True)
     
-    loading_screen(f"Fetching files for {category}", 3)
-    files = github_sync.list_remote_files(category)
+    with RichProgressReporter(f"Listing files in {category}", console):
+        files = github_sync.list_remote_files(category)
     
     if files:
-        file_choices = [f["name"] for f in files if f["type"] == "file"]
+        entries = {f["name"]: f for f in files if f["type"] == "file"}
         selected_files = questionary.checkbox(
             f"Select files to download to '{category}':",
-            choices=file_choices
+            choices=list(entries)
         ).ask()
         
         if selected_files:
-            loading_screen(f"Downloading {len(selected_files)} files", 3)
-            success_count = 0
-            for file_name in selected_files:
-                remote_path = f"{category}/{file_name}"
-                local_path = category_path / file_name
-                if github_sync.download_file(remote_path, local_path):
-                    success_count += 1
+            items = [
+                {
+                    "remote_path": entries[file_name]["path"],
+                    "local_path": category_path / file_name,
+                    "sha": entries[file_name]["sha"],
+                    "size": entries[file_name]["size"]
+                }
+                for file_name in selected_files
+            ]
+            def download(progress):
+                results = github_sync.download_files(
+                    items, on_result=lambda result: report_download(result, progress.log), progress=progress
+                )
+                success_count = sum(1 for result in results if result["ok"])
+                return f"[green]Successfully downloaded {success_count}/{len(items)} files to {category}/[/green]"
             
-            console.print(Panel(
-                f"[green]Successfully downloaded {success_count}/{len(selected_files)} files to {category}/[/green]",
-                title="Download Complete",
-                border_style="green"
-            ))
+            run_job(f"Download {len(items)} files to {category}", download, "Download Complete")
     else:
         console.print(Panel(
             f"[yellow]No files found in category '{category}'[/yellow]",
@@ -243,6 +418,9 @@ def fetch_files():
 
 def fetch_from_community():
     """Download files from community repository"""
+    import questionary
+    github_sync = get_github_sync()
+    
     category = questionary.text(
         "Enter category name:",
         instruction="(leave empty for all categories)"
@@ -251,12 +429,14 @@ def fetch_from_community():
     if category == "":  # User wants all categories
         category = None
     
-    loading_screen("Fetching from community", 3)
-    files = github_sync.fetch_from_community(category)
+    # Resolve the community repo before the progress bar so its prompts stay usable
+    github_sync.setup_community_repo()
+    with RichProgressReporter("Listing community files", console):
+        files = github_sync.fetch_from_community(category)
     
     if files:
-        file_choices = [f["name"] for f in files if f["type"] == "file"]
-        if not file_choices:
+        entries = {f["name"]: f for f in files if f["type"] == "file"}
+        if not entries:
             console.print(Panel(
                 f"[yellow]No files found in category '{category}'[/yellow]",
                 title="No Files Found",
@@ -267,40 +447,40 @@ def fetch_from_community():
         
         selected_files = questionary.checkbox(
             f"Select files to download from community:",
-            choices=file_choices
+            choices=list(entries)
         ).ask()
         
         if selected_files:
-            loading_screen(f"Downloading {len(selected_files)} files", 3)
-            success_count = 0
-            
             # Determine local directory
             local_category = category if category else "community"
             category_path = Path("java_files") / local_category
             category_path.mkdir(exist_ok=True)
             
-            for file_name in selected_files:
-                remote_path = f"{category}/{file_name}" if category else file_name
-                local_path = category_path / file_name
-                
-                # Use GitHub API to download file content
-                repo = github_sync.setup_community_repo()
+            # Resolve the community repo once for the whole batch
+            repo = github_sync.setup_community_repo()
+            items = [
+                {
+                    "remote_path": entries[file_name]["path"],
+                    "local_path": category_path / file_name,
+                    "sha": entries[file_name]["sha"],
+                    "size": entries[file_name]["size"]
+                }
+                for file_name in selected_files
+            ]
+            def download(progress):
+                results = []
                 if repo:
-                    try:
-                        file_content = repo.get_contents(remote_path)
-                        with open(local_path, 'w', encoding='utf-8') as f:
-                            f.write(file_content.decoded_content.decode())
-                        success_count += 1
-                        console.print(f"[green]Downloaded: {file_name}[/green]")
-                    except Exception as e:
-                        console.print(f"[red]Failed to download {file_name}: {e}[/red]")
+                    results = github_sync.download_files(
+                        items, repo=repo, on_result=lambda result: report_download(result, progress.log),
+                        progress=progress
+                    )
+                success_count = sum(1 for result in results if result["ok"])
+                return (
+                    f"[green]Successfully downloaded {success_count}/{len(items)} files[/green]\n"
+                    f"Location: java_files/{local_category}/"
+                )
             
-            console.print(Panel(
-                f"[green]Successfully downloaded {success_count}/{len(selected_files)} files[/green]\n"
-                f"Location: java_files/{local_category}/",
-                title="Community Download Complete",
-                border_style="green"
-            ))
+            run_job(f"Download {len(items)} community files", download, "Community Download Complete")
     else:
         console.print(Panel(
             f"[yellow]No files found in community repository[/yellow]",
@@ -310,8 +490,71 @@ def fetch_from_community():
     
     input("Press Enter to continue...")
 
+def fetch_all(community=False):
+    """Mirror whole categories into java_files/ from one repository archive"""
+    import questionary
+    github_sync = get_github_sync()
+    
+    if not github_sync.client:
+        console.print(Panel(
+            "[red]Please setup GitHub authentication first using 'auth' command[/red]",
+            title="Authentication Required",
+            border_style="red"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    # Contributor bookkeeping in the community repo is not course material
+    exclude = ("contributors", "verification_requests") if community else ()
+    repo = github_sync.setup_community_repo() if community else github_sync.setup_repo()
+    if not repo:
+        input("Press Enter to continue...")
+        return
+    
+    with RichProgressReporter("Listing repository", console) as progress:
+        manifest = github_sync.get_remote_manifest(repo, progress=progress)
+    categories = github_sync.remote_categories(manifest, exclude)
+    
+    if not categories:
+        console.print(Panel(
+            "[yellow]No categories found in repository[/yellow]",
+            title="No Files Found",
+            border_style="yellow"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    selected = questionary.checkbox(
+        "Select categories to mirror into java_files/:",
+        choices=[questionary.Choice(category, checked=True) for category in categories]
+    ).ask()
+    
+    if selected:
+        def mirror(progress):
+            def report_failure(result):
+                if not result["ok"]:
+                    report_download(result, progress.log)
+            
+            results = github_sync.fetch_archive(
+                repo, selected, exclude, manifest, on_result=report_failure, progress=progress
+            )
+            updated = sum(1 for result in results if result["ok"] and result["source"] != "local")
+            unchanged = sum(1 for result in results if result["source"] == "local")
+            failed = sum(1 for result in results if not result["ok"])
+            return (
+                f"[green]Updated {updated} files, {unchanged} already up to date[/green]"
+                + (f"\n[red]{failed} files failed[/red]" if failed else "")
+            )
+        
+        run_job(f"Mirror {len(selected)} categories", mirror, "Mirror Complete")
+    
+    input("Press Enter to continue...")
+
 def request_verification():
     """Request contributor verification"""
+    import questionary
+    github_sync = get_github_sync()
+    
     if not github_sync.client:
         console.print(Panel(
             "[red]Please setup GitHub authentication first using 'auth' command[/red]",
@@ -321,7 +564,7 @@ def request_verification():
         input("Press Enter to continue...")
         return
     
-    user = github_sync.client.get_user()
+    user = github_sync.session.user
     
     console.print(Panel(
         f"[bold]Contributor Verification Request[/bold]\n\n"
@@ -338,8 +581,9 @@ def request_verification():
     confirm = questionary.confirm("Submit verification request?").ask()
     
     if confirm:
-        loading_screen("Submitting request", 2)
-        if github_sync.request_verification():
+        with console.status("[cyan]Submitting request..."):
+            submitted = github_sync.request_verification()
+        if submitted:
             console.print(Panel(
                 f"[green]Verification request submitted successfully![/green]\n"
                 f"Username: {user.login}\n"
@@ -356,8 +600,339 @@ def request_verification():
     
     input("Press Enter to continue...")
 
+def sync_with_github():
+    """Two-way sync of java_files/ with the personal repository"""
+    import questionary
+    github_sync = get_github_sync()
+    
+    if not github_sync.client:
+        console.print(Panel(
+            "[red]Please setup GitHub authentication first using 'auth' command[/red]",
+            title="Authentication Required",
+            border_style="red"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    from sync_engine import SyncEngine
+    engine = SyncEngine(github_sync)
+    try:
+        with RichProgressReporter("Comparing local files with GitHub", console) as progress:
+            prepared = engine.prepare(progress)
+    except Exception as e:
+        console.print(Panel(
+            f"[red]Sync failed: {e}[/red]",
+            title="Sync Failed",
+            border_style="red"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    if not prepared:
+        console.print(Panel(
+            "[red]Could not access your personal repository[/red]",
+            title="Sync Failed",
+            border_style="red"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    repo, state, local, remote, plan = prepared
+    pending = sum(len(plan[key]) for key in ("upload", "download", "delete_local", "delete_remote"))
+    
+    if pending == 0 and not plan["conflicts"]:
+        engine.apply(repo, state, local, remote, plan)
+        console.print(Panel(
+            f"[green]Everything is up to date ({len(local)} files)[/green]",
+            title="Sync Status",
+            border_style="green"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    plan_table = Table(
+        title="[bold]Sync Plan[/bold]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+        title_style="bold cyan"
+    )
+    plan_table.add_column("Action", style="bold green", width=15)
+    plan_table.add_column("File", style="white")
+    
+    labels = [
+        ("upload", "[green]UPLOAD[/green]"),
+        ("download", "[cyan]DOWNLOAD[/cyan]"),
+        ("delete_remote", "[red]DELETE REMOTE[/red]"),
+        ("delete_local", "[red]DELETE LOCAL[/red]"),
+        ("conflicts", "[yellow]CONFLICT[/yellow]")
+    ]
+    for key, label in labels:
+        for path in plan[key]:
+            plan_table.add_row(label, path)
+    console.print(plan_table)
+    
+    if plan["conflicts"]:
+        console.print(Panel(
+            "[yellow]Conflicting files changed on both sides and will be left untouched.[/yellow]\n"
+            "Resolve them manually and run 'sync' again.",
+            title="Conflicts Detected",
+            border_style="yellow"
+        ))
+    
+    if pending and questionary.confirm(f"Apply {pending} changes?").ask():
+        def apply(progress):
+            errors = engine.apply(repo, state, local, remote, plan, progress)
+            for path, error in errors:
+                progress.log(f"[red]{path}: {error}[/red]")
+            if errors:
+                return f"[red]Sync finished with {len(errors)} errors[/red]"
+            return f"[green]Sync completed - {pending} files updated[/green]"
+        
+        run_job(f"Sync {pending} files", apply, "Sync Status")
+    
+    input("Press Enter to continue...")
+
+def watch_files():
+    """Back up saved files to the personal repository as they change"""
+    github_sync = get_github_sync()
+    
+    if not github_sync.client:
+        console.print(Panel(
+            "[red]Please setup GitHub authentication first using 'auth' command[/red]",
+            title="Authentication Required",
+            border_style="red"
+        ))
+        input("Press Enter to continue...")
+        return
+    
+    from watch_mode import WatchMode
+    watcher = WatchMode(get_file_manager(), github_sync)
+    
+    console.print(Panel(
+        "[bold]Watching java_files/ for saved changes[/bold]\n"
+        f"Changes are pushed as one commit after {watcher.collector.debounce:.0f}s without new edits.\n"
+        "Press [cyan]Ctrl+C[/cyan] to stop.",
+        title="Watch Mode",
+        border_style="blue"
+    ))
+    watcher.run()
+    
+    console.print(Panel(
+        f"[green]Watch stopped - {watcher.files_pushed} files pushed in {watcher.commits} commits[/green]",
+        title="Watch Mode",
+        border_style="green"
+    ))
+    input("Press Enter to continue...")
+
+def show_job(job):
+    """Details and log of one background job"""
+    lines = [
+        f"[bold]Status:[/bold] {job.status}",
+        f"[bold]Stage:[/bold] {job.description}",
+        f"[bold]Progress:[/bold] {job.done}/{job.total if job.total is not None else '?'}"
+        + (f" ({format_bytes(job.bytes)})" if job.bytes else ""),
+        f"[bold]Elapsed:[/bold] {job.elapsed():.1f}s"
+    ]
+    if job.result:
+        lines.append(job.result)
+    if job.error:
+        lines.append(f"[red]Error: {job.error}[/red]")
+    if job.messages:
+        lines.append("")
+        lines.extend(job.messages[-20:])
+    console.print(Panel("\n".join(lines), title=f"Job #{job.id}: {job.name}", border_style="blue"))
+
+def show_jobs():
+    """List background jobs; show details or cancel one"""
+    from jobs import get_job_manager
+    manager = get_job_manager()
+    styles = {"queued": "yellow", "running": "cyan", "done": "green", "failed": "red", "cancelled": "bright_black"}
+    
+    while True:
+        jobs = manager.list()
+        if not jobs:
+            console.print(Panel(
+                "[yellow]No background jobs in this session[/yellow]",
+                title="Jobs",
+                border_style="yellow"
+            ))
+            input("Press Enter to continue...")
+            return
+        
+        table = Table(
+            title="[bold]Background Jobs[/bold]",
+            box=box.ROUNDED,
+            header_style="bold magenta",
+            title_style="bold cyan"
+        )
+        table.add_column("#", style="bold", justify="right")
+        table.add_column("Job", style="white")
+        table.add_column("Status")
+        table.add_column("Progress", justify="right")
+        table.add_column("Time", justify="right")
+        table.add_column("Result / Current", style="white", max_width=40, overflow="ellipsis")
+        for job in jobs:
+            progress = f"{job.done}/{job.total}" if job.total else str(job.done or "")
+            if job.bytes:
+                progress += f" {format_bytes(job.bytes)}"
+            if job.active:
+                detail = job.item or job.description
+            else:
+                detail = job.error or job.result or ""
+            table.add_row(
+                str(job.id), job.name, f"[{styles[job.status]}]{job.status}[/{styles[job.status]}]",
+                progress, f"{job.elapsed():.0f}s", Text.from_markup(detail.split("\n")[0])
+            )
+        console.print(table)
+        
+        action = input("Job # for details, 'cancel <#>', 'clear', 'r' to refresh, Enter to go back: ").strip().lower()
+        if not action:
+            return
+        elif action == "r":
+            continue
+        elif action == "clear":
+            manager.clear_finished()
+        elif action.startswith("cancel"):
+            target = action[len("cancel"):].strip()
+            if target.isdigit() and manager.cancel(int(target)):
+                console.print(f"[yellow]Cancelling job #{target}...[/yellow]")
+            else:
+                console.print(f"[red]No running job #{target or '?'}[/red]")
+        elif action.isdigit() and manager.get(int(action)):
+            show_job(manager.get(int(action)))
+        else:
+            console.print("[red]Unknown job command[/red]")
+
+def show_queue():
+    """List queued uploads; retry or drop the ones that failed"""
+    from upload_queue import get_upload_queue, pending_uploads, PERSONAL
+    
+    while True:
+        if not any(pending_uploads()):
+            console.print(Panel(
+                "[green]No uploads queued[/green]",
+                title="Upload Queue",
+                border_style="green"
+            ))
+            input("Press Enter to continue...")
+            return
+        queue = get_upload_queue()
+        
+        table = Table(
+            title="[bold]Upload Queue[/bold]",
+            box=box.ROUNDED,
+            header_style="bold magenta",
+            title_style="bold cyan"
+        )
+        table.add_column("Target", style="white")
+        table.add_column("File", style="white")
+        table.add_column("Status")
+        table.add_column("Last Error", style="white", max_width=50, overflow="ellipsis")
+        for _, repo, category, name, attempts, failed, error in queue.entries():
+            if failed:
+                status = "[red]failed[/red]"
+            elif attempts:
+                status = f"[yellow]retrying ({attempts})[/yellow]"
+            else:
+                status = "[cyan]pending[/cyan]"
+            table.add_row(
+                "personal" if repo == PERSONAL else repo, f"{category}/{name}", status,
+                Text((error or "").split("\n")[0])
+            )
+        console.print(table)
+        
+        action = input("'retry' or 'drop' failed uploads, 'r' to refresh, Enter to go back: ").strip().lower()
+        if not action:
+            return
+        elif action == "r":
+            continue
+        elif action == "retry":
+            count = queue.retry_failed()
+            if count:
+                queue.start(get_github_sync())
+            console.print(f"[green]{count} upload(s) queued again[/green]")
+        elif action == "drop":
+            console.print(f"[yellow]{queue.drop_failed()} failed upload(s) dropped[/yellow]")
+        else:
+            console.print("[red]Unknown queue command[/red]")
+
+def show_stats(export=False):
+    """GitHub API usage per command for this session"""
+    from config_manager import ConfigManager
+    snapshot = get_metrics().snapshot()
+    
+    if not snapshot["commands"]:
+        console.print(Panel(
+            "[yellow]No GitHub requests made yet in this session[/yellow]",
+            title="API Stats",
+            border_style="yellow"
+        ))
+    else:
+        table = Table(
+            title="[bold]GitHub API Usage[/bold]",
+            box=box.ROUNDED,
+            header_style="bold magenta",
+            title_style="bold cyan"
+        )
+        table.add_column("Command", style="bold green")
+        table.add_column("Runs", justify="right")
+        table.add_column("Req", justify="right")
+        table.add_column("Err", justify="right")
+        table.add_column("304", justify="right")
+        table.add_column("Sent", justify="right")
+        table.add_column("Recv", justify="right")
+        table.add_column("p50/p95 ms", justify="right")
+        table.add_column("Quota used", justify="right")
+        
+        histogram = Table(
+            title="[bold]Request Latency (ms)[/bold]",
+            box=box.ROUNDED,
+            header_style="bold magenta",
+            title_style="bold cyan"
+        )
+        histogram.add_column("Command", style="bold green")
+        buckets = next(iter(snapshot["commands"].values()))["latency_ms"]["buckets"]
+        for bound in buckets:
+            histogram.add_column(f"≤{bound}" if bound != "inf" else "more", justify="right")
+        
+        for name, stats in snapshot["commands"].items():
+            latency = stats["latency_ms"]
+            table.add_row(
+                name,
+                str(stats["runs"]),
+                str(stats["requests"]),
+                f"[red]{stats['errors']}[/red]" if stats["errors"] else "0",
+                str(stats["not_modified"]),
+                format_bytes(stats["bytes_sent"]),
+                format_bytes(stats["bytes_received"]),
+                f"{latency['p50']:.0f}/{latency['p95']:.0f}",
+                str(sum(stats["rate_limit_used"].values()))
+            )
+            histogram.add_row(name, *[str(count) if count else "" for count in latency["buckets"].values()])
+        
+        console.print(table)
+        console.print(histogram)
+        for resource, quota in snapshot["rate_limit_remaining"].items():
+            console.print(f"[bright_black]{resource}: {quota['remaining']}/{quota['limit']} requests left[/bright_black]")
+    
+    if export:
+        path = os.path.expanduser(
+            ConfigManager().get("api_stats_file") or str(Path.home() / ".codelens" / "api_stats.json")
+        )
+        try:
+            get_metrics().export(path)
+            console.print(f"[green]Exported to {path}[/green]")
+        except OSError as e:
+            console.print(f"[red]Export failed: {e}[/red]")
+    else:
+        console.print("[bright_black]Run 'stats --json' to export these numbers as JSON[/bright_black]")
+    input("Press Enter to continue...")
+
 def browse_files():
+    file_manager = get_file_manager()
+    
     current_path = None
+    prewarmed_path = None
     while True:
         if file_manager.check_for_changes():
             console.print(Panel(
@@ -368,6 +943,14 @@ def browse_files():
         items, current_path = file_manager.list_directory(current_path)
         file_manager.display_files_table(items, current_path)
         
+        if current_path != prewarmed_path:
+            # Lex this directory's sources while the user picks one
+            from highlight_cache import get_token_cache
+            get_token_cache().prewarm(
+                os.path.join(current_path, item["name"]) for item in items if item["type"] == "FILE"
+            )
+            prewarmed_path = current_path
+        
         console.print(Panel(
             "[bold]Navigation Commands:[/bold]\n"
             "[cyan]cd <folder>[/cyan] - Enter directory\n"
@@ -389,8 +972,8 @@ def browse_files():
         elif command.startswith("cd "):
             folder = command[3:]
             new_path = os.path.join(current_path, folder)
-            if os.path.exists(new_path) and os.path.isdir(new_path):
-                current_path = new_path
+            if file_manager.is_directory(new_path):
+                current_path = os.path.normpath(new_path)
             else:
                 console.print(Panel(
                     f"[red]Directory '{folder}' not found[/red]",
@@ -399,7 +982,7 @@ def browse_files():
         elif command.startswith("view "):
             filename = command[5:]
             file_path = os.path.join(current_path, filename)
-            if os.path.exists(file_path) and os.path.isfile(file_path):
+            if file_manager.is_file(file_path):
                 view_file_content(file_path)
             else:
                 console.print(Panel(
@@ -412,33 +995,96 @@ def browse_files():
                 border_style="red"
             ))
 
+def search_files():
+    import questionary
+    index = get_search_index()
+    
+    while True:
+        query = questionary.text(
+            f"Search {index.file_count()} files (class, method or keyword; empty to return):"
+        ).ask()
+        if not query or not query.strip():
+            break
+        
+        started = time.perf_counter()
+        results = index.search(query)
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        if not results:
+            console.print(Panel(
+                f"[yellow]No matches for '{query}'[/yellow]",
+                border_style="yellow"
+            ))
+            continue
+        
+        table = Table(
+            title=f"{len(results)} results for '{query}' ({elapsed:.1f} ms)",
+            box=box.ROUNDED,
+            header_style="bold magenta",
+            title_style="bold cyan"
+        )
+        table.add_column("#", style="bold green", justify="right")
+        table.add_column("File", style="white")
+        table.add_column("Line", justify="right")
+        table.add_column("Match", style="cyan")
+        table.add_column("Score", justify="right")
+        for number, result in enumerate(results, 1):
+            match = result["symbol"] or (index.line_text(result["path"], result["line"]) if result["line"] else "")
+            table.add_row(
+                str(number),
+                result["path"],
+                str(result["line"] or "-"),
+                match[:60],
+                f"{result['score']:.2f}"
+            )
+        console.print(table)
+        
+        choice = questionary.text("Open result # (Enter to search again):").ask()
+        if choice and choice.strip().isdigit() and 1 <= int(choice) <= len(results):
+            view_file_content(str(index.root / results[int(choice) - 1]["path"]))
+
 def view_file_content(file_path):
-    loading_screen(f"Loading {os.path.basename(file_path)}", 2)
+    from config_manager import ConfigManager
     try:
+        if os.path.getsize(file_path) > ConfigManager().get("pager_threshold", PAGER_THRESHOLD):
+            # Large files are paged from a memory map instead of read whole
+            from pager import FilePager
+            from highlight_cache import get_token_cache
+            token_cache = get_token_cache()
+            # Only highlight if already tokenized; lexing would defeat paging
+            tokens = token_cache.lookup(file_path)
+            highlight = (lambda number, text: token_cache.render_line(tokens, number, text)) if tokens else None
+            FilePager(file_path, console, highlight=highlight).run()
+            return
+        
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        tokens = None
+        token_cache = None
+        from highlight_cache import TokenCache, get_token_cache
+        if TokenCache.supports(file_path):
+            token_cache = get_token_cache()
+            tokens = token_cache.get(file_path, content)
+        
+        from source_parser import split_sections
         code_section = []
         output_section = []
-        
-        lines = content.split('\n')
-        in_output_section = False
-        
-        for line in lines:
-            if line.strip().startswith('// output'):
-                in_output_section = True
-                output_section.append(line.replace('// output', '').strip())
-            elif in_output_section:
-                if line.strip().startswith('//'):
-                    output_section.append(line.replace('//', '').strip())
-                else:
-                    in_output_section = False
-                    code_section.append(line)
+        for kind, number, line in split_sections(content.split('\n')):
+            if kind == "output":
+                output_section.append(line)
             else:
-                code_section.append(line)
+                code_section.append((number, line))
+        
+        if token_cache:
+            code_text = Text("\n").join(
+                token_cache.render_line(tokens, number, line) for number, line in code_section
+            )
+        else:
+            code_text = Text('\n'.join(line for _, line in code_section))
         
         console.print(Panel(
-            '\n'.join(code_section),
+            code_text,
             title=f"FILE: {os.path.basename(file_path)}",
             border_style="blue"
         ))
@@ -459,6 +1105,14 @@ def view_file_content(file_path):
         ))
 
 def main():
+    profiling = "--profile-startup" in sys.argv
+    
+    # Resume uploads left queued by an earlier session
+    from upload_queue import pending_uploads
+    if pending_uploads()[0]:
+        from upload_queue import get_upload_queue
+        get_upload_queue().start(get_github_sync())
+    
     while True:
         os.system('cls' if os.name == 'nt' else 'clear')
         display_header()
@@ -470,56 +1124,85 @@ def main():
         ))
         
         linux_prompt()
+        if profiling:
+            # Taken here so the header and menu count: the user waits for them too
+            ready_at = time.perf_counter()
+            from startup_profile import profile_startup
+            console.print()
+            profile_startup(_STARTED_AT, ready_at, console)
+            return
         command = input().strip().lower()
         
-        if command == "exit":
-            console.print(Panel(
-                "[blue]Shutting down Code-Lens...[/blue]",
-                border_style="blue"
-            ))
-            break
-        elif command == "browse":
-            loading_screen("Loading file browser", 2)
-            browse_files()
-        elif command == "upload":
-            loading_screen("Initializing upload", 2)
-            upload_file()
-        elif command == "upload-community":
-            loading_screen("Initializing community upload", 2)
-            upload_to_community()
-        elif command == "sync":
-            loading_screen("Syncing with GitHub", 3)
-            console.print(Panel(
-                "[green]Sync operation completed[/green]",
-                title="Sync Status",
-                border_style="green"
-            ))
-            input("Press Enter to continue...")
-        elif command == "fetch":
-            loading_screen("Initializing file fetch", 2)
-            fetch_files()
-        elif command == "fetch-community":
-            loading_screen("Initializing community fetch", 2)
-            fetch_from_community()
-        elif command == "verify-me":
-            request_verification()
-        elif command == "auth":
-            from github_auth import setup_authentication
-            setup_authentication()
-        elif command == "settings":
-            console.print(Panel(
-                "[yellow]Settings panel - coming soon[/yellow]",
-                title="Settings",
-                border_style="yellow"
-            ))
-            input("Press Enter to continue...")
-        else:
-            console.print(Panel(
-                f"[red]Unknown command: {command}[/red]",
-                title="Command Error",
-                border_style="red"
-            ))
-            input("Press Enter to continue...")
+        # Attribute GitHub requests made by this command to it
+        with get_metrics().command(command):
+            if command == "exit":
+                if "jobs" in sys.modules:
+                    from jobs import get_job_manager
+                    running = get_job_manager().active()
+                    if running:
+                        import questionary
+                        if not questionary.confirm(f"{len(running)} background job(s) still running. Cancel them and exit?").ask():
+                            continue
+                        get_job_manager().cancel_all()
+                console.print(Panel(
+                    "[blue]Shutting down Code-Lens...[/blue]",
+                    border_style="blue"
+                ))
+                break
+            elif command == "browse":
+                browse_files()
+            elif command == "search":
+                search_files()
+            elif command == "upload":
+                upload_file()
+            elif command == "upload-community":
+                upload_to_community()
+            elif command == "sync":
+                sync_with_github()
+            elif command == "watch":
+                watch_files()
+            elif command == "jobs":
+                show_jobs()
+            elif command == "queue":
+                show_queue()
+            elif command == "stats":
+                show_stats()
+            elif command == "stats --json":
+                show_stats(export=True)
+            elif command == "fetch":
+                fetch_files()
+            elif command == "fetch --all":
+                fetch_all()
+            elif command == "fetch-community":
+                fetch_from_community()
+            elif command == "fetch-community --all":
+                fetch_all(community=True)
+            elif command == "verify-me":
+                request_verification()
+            elif command == "auth":
+                from github_auth import setup_authentication
+                if setup_authentication():
+                    # Rebuild the client with the new token on next use
+                    global _github_sync
+                    _github_sync = None
+                    from upload_queue import pending_uploads
+                    if pending_uploads()[0]:
+                        from upload_queue import get_upload_queue
+                        get_upload_queue().start(get_github_sync())
+            elif command == "settings":
+                console.print(Panel(
+                    "[yellow]Settings panel - coming soon[/yellow]",
+                    title="Settings",
+                    border_style="yellow"
+                ))
+                input("Press Enter to continue...")
+            else:
+                console.print(Panel(
+                    f"[red]Unknown command: {command}[/red]",
+                    title="Command Error",
+                    border_style="red"
+                ))
+                input("Press Enter to continue...")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
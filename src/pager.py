@@ -0,0 +1,184 @@
+import bisect
+import mmap
+import os
+import re
+from array import array
+from rich.console import Console
+from rich.panel import Panel
+from rich.text import Text
+
+CHECKPOINT_LINES = 256  # one stored offset per this many lines
+
+class LineIndex:
+    """Lazy line-offset index over a memory-mapped file
+
+    Only the byte offset of every CHECKPOINT_LINES-th line is stored, and
+    only as far into the file as has been viewed, so opening costs
+    nothing and memory stays small whatever the file size. Any other
+    line is found by scanning forward from the nearest checkpoint.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+        self.checkpoints = array('Q', [0])
+        self.total_lines = 0 if self.size == 0 else None  # known once the scan reaches the end
+
+    def _next_line(self, offset):
+        """Offset of the line after the one starting at offset, or None"""
+        newline = self.data.find(b"\n", offset)
+        if newline == -1 or newline + 1 >= self.size:
+            return None
+        return newline + 1
+
+    def _extend(self, checkpoint):
+        """Scan forward until the given checkpoint exists or EOF is hit"""
+        while len(self.checkpoints) <= checkpoint and self.total_lines is None:
+            offset = self.checkpoints[-1]
+            base = (len(self.checkpoints) - 1) * CHECKPOINT_LINES
+            for count in range(1, CHECKPOINT_LINES + 1):
+                offset = self._next_line(offset)
+                if offset is None:
+                    self.total_lines = base + count
+                    break
+            else:
+                self.checkpoints.append(offset)
+
+    def offset(self, line):
+        """Byte offset where a 0-based line starts, or None past the end"""
+        if self.size == 0:
+            return None
+        checkpoint = line // CHECKPOINT_LINES
+        self._extend(checkpoint)
+        if checkpoint >= len(self.checkpoints):
+            return None
+        offset = self.checkpoints[checkpoint]
+        for _ in range(line % CHECKPOINT_LINES):
+            offset = self._next_line(offset)
+            if offset is None:
+                return None
+        return offset
+
+    def lines(self, start, count):
+        """Decoded text of up to count lines starting at a 0-based line"""
+        offset = self.offset(start)
+        result = []
+        while offset is not None and len(result) < count:
+            end = self.data.find(b"\n", offset)
+            end = self.size if end == -1 else end
+            result.append(self.data[offset:end].decode('utf-8', errors='replace').rstrip("\r"))
+            offset = end + 1 if end + 1 < self.size else None
+        return result
+
+    def line_of(self, offset):
+        """0-based line number containing a byte offset"""
+        while self.total_lines is None and self.checkpoints[-1] <= offset:
+            self._extend(len(self.checkpoints))
+        checkpoint = bisect.bisect_right(self.checkpoints, offset) - 1
+        start = self.checkpoints[checkpoint]
+        return checkpoint * CHECKPOINT_LINES + self.data[start:offset].count(b"\n")
+
+    def line_count(self):
+        """Total number of lines; scans the rest of the file once"""
+        while self.total_lines is None:
+            self._extend(len(self.checkpoints))
+        return self.total_lines
+
+    def search(self, pattern, from_line=0):
+        """0-based line of the next case-insensitive match, or None"""
+        start = self.offset(from_line)
+        if start is None:
+            return None
+        match = re.compile(re.escape(pattern.encode('utf-8')), re.I).search(self.data, start)
+        return self.line_of(match.start()) if match else None
+
+class FilePager:
+    """Page through a file one screen at a time without loading it"""
+
+    def __init__(self, file_path, console=None, height=None, highlight=None):
+        self.file_path = file_path
+        self.highlight = highlight  # optional (0-based line, text) -> Text
+        self.console = console or Console()
+        self.height = height or max(5, self.console.size.height - 9)
+        self.top = 0
+        self.last_search = None
+
+    def render(self, index):
+        lines = index.lines(self.top, self.height)
+        width = len(str(self.top + len(lines)))
+        body = Text(no_wrap=True, overflow="ellipsis")
+        for number, line in enumerate(lines, self.top + 1):
+            if number > self.top + 1:
+                body.append("\n")
+            body.append(f"{number:>{width}} ", style="bright_black")
+            text = self.highlight(number - 1, line) if self.highlight else Text(line)
+            text.expand_tabs(4)
+            body.append(text)
+        total = index.total_lines if index.total_lines is not None else "?"
+        end = self.top + len(lines)
+        self.console.print(Panel(
+            body,
+            title=f"FILE: {os.path.basename(self.file_path)}",
+            subtitle=f"lines {self.top + 1 if lines else 0}-{end} of {total}",
+            border_style="blue"
+        ))
+
+    def run(self):
+        """Interactive loop; returns when the user quits"""
+        with open(self.file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b""
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                self._loop(LineIndex(data))
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
+    def _loop(self, index):
+        message = None
+        while True:
+            self.render(index)
+            if message:
+                self.console.print(message)
+                message = None
+            self.console.print(
+                "[cyan]Enter[/cyan] next page  [cyan]b[/cyan] back  [cyan]g <line>[/cyan] go to line  "
+                "[cyan]G[/cyan] end  [cyan]/<text>[/cyan] search  [cyan]n[/cyan] next match  [cyan]q[/cyan] quit"
+            )
+            command = input(": ").strip()
+
+            if command in ("q", "quit", "exit"):
+                break
+            elif command in ("", "f", "j"):
+                if index.offset(self.top + self.height) is not None:
+                    self.top += self.height
+                else:
+                    message = "[yellow]End of file[/yellow]"
+            elif command in ("b", "k"):
+                self.top = max(0, self.top - self.height)
+            elif command == "G":
+                self.top = max(0, index.line_count() - self.height)
+            elif command.startswith("g"):
+                target = command[1:].strip()
+                if target.isdigit() and index.offset(max(0, int(target) - 1)) is not None:
+                    self.top = max(0, int(target) - 1)
+                else:
+                    message = f"[red]No line {target or '?'}[/red]"
+            elif command.startswith("/") or command == "n":
+                if command.startswith("/") and command[1:]:
+                    self.last_search = command[1:]
+                    from_line = self.top
+                else:
+                    from_line = self.top + 1
+                if not self.last_search:
+                    message = "[yellow]Nothing to search for - use /<text>[/yellow]"
+                    continue
+                line = index.search(self.last_search, from_line)
+                if line is None:
+                    message = f"[yellow]'{self.last_search}' not found below line {from_line + 1}[/yellow]"
+                else:
+                    self.top = line
+            else:
+                message = "[red]Unknown command[/red]"
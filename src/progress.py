@@ -0,0 +1,109 @@
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+console = Console()
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+class ProgressReporter:
+    """Receiver for progress events emitted by long-running operations
+
+    Operations call start() with the number of items (None when unknown),
+    advance() once per finished item, update() when switching stage and
+    log() for a message worth showing the user. The base class ignores
+    everything, so operations can always report.
+    """
+
+    def start(self, total=None, description=None):
+        pass
+
+    def update(self, description):
+        pass
+
+    def advance(self, item=None, nbytes=0, count=1):
+        pass
+
+    def log(self, message):
+        pass
+
+    def finish(self):
+        pass
+
+NULL_PROGRESS = ProgressReporter()
+
+class RichProgressReporter(ProgressReporter):
+    """Render progress events as a Rich progress bar while work runs"""
+
+    def __init__(self, description, console=console):
+        self.description = description
+        self.done = 0
+        self.bytes = 0
+        self.total = None
+        self.progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[cyan]{task.description}"),
+            BarColumn(),
+            TextColumn("{task.fields[counter]}"),
+            TextColumn("[bright_black]{task.fields[transferred]}"),
+            TextColumn("[white]{task.fields[item]}"),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True
+        )
+        self.task = None
+
+    def __enter__(self):
+        self.progress.start()
+        self.task = self.progress.add_task(
+            self.description, total=None, counter="", transferred="", item=""
+        )
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+        return False
+
+    def start(self, total=None, description=None):
+        self.done = 0
+        self.bytes = 0
+        self.total = total
+        self.progress.update(
+            self.task,
+            total=total,
+            completed=0,
+            description=description or self.description,
+            counter=f"0/{total}" if total else "",
+            transferred="",
+            item=""
+        )
+
+    def update(self, description):
+        self.progress.update(self.task, description=description)
+
+    def advance(self, item=None, nbytes=0, count=1):
+        self.done += count
+        self.bytes += nbytes
+        self.progress.update(
+            self.task,
+            advance=count,
+            counter=f"{self.done}/{self.total}" if self.total else str(self.done),
+            transferred=format_bytes(self.bytes) if self.bytes else "",
+            item=item or ""
+        )
+
+    def log(self, message):
+        self.progress.console.print(message)
+
+    def finish(self):
+        if self.progress.live.is_started:
+            self.progress.stop()
@@ -0,0 +1,149 @@
+import threading
+import time
+from config_manager import ConfigManager
+
+RETRYABLE_SERVER_ERRORS = (500, 502, 503, 504)
+
+class RequestScheduler:
+    """Rate-limit-aware pacing and retry for every GitHub request
+
+    Installed as transport middleware, it tracks X-RateLimit-* headers
+    per resource (core, graphql, search), slows down as the remaining
+    quota approaches the reserve, spaces write requests to stay clear of
+    secondary limits, bounds concurrency and retries 403/429 and 5xx
+    responses using Retry-After or the rate-limit reset time.
+    """
+
+    def __init__(self, max_concurrent=8, write_interval=1.0, reserve=20, max_retries=5, max_wait=900):
+        self.max_concurrent = max_concurrent
+        self.write_interval = write_interval
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.last_write = 0.0
+        self.quotas = {}
+        self.retries = 0
+        self.waited = 0.0
+
+    @staticmethod
+    def resource_for(url):
+        if "/graphql" in url:
+            return "graphql"
+        if "/search/" in url:
+            return "search"
+        return "core"
+
+    def quota(self, resource="core"):
+        """Return the last seen (remaining, limit, reset epoch) or None"""
+        with self.lock:
+            return self.quotas.get(resource)
+
+    def _observe(self, response, resource):
+        headers = {k.lower(): v for k, v in response.getheaders()}
+        try:
+            remaining = int(headers["x-ratelimit-remaining"])
+            limit = int(headers["x-ratelimit-limit"])
+            reset = float(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            return headers
+        with self.lock:
+            self.quotas[headers.get("x-ratelimit-resource", resource)] = (remaining, limit, reset)
+        return headers
+
+    def _quota_delay(self, resource):
+        """Seconds to wait so the remaining quota lasts until reset"""
+        quota = self.quota(resource)
+        if not quota:
+            return 0
+        remaining, limit, reset = quota
+        until_reset = reset - time.time()
+        if until_reset <= 0:
+            return 0
+        if remaining <= self.reserve:
+            return until_reset + 1
+        # Below 10% of the limit, spread what's left over the window
+        if remaining < limit * 0.1:
+            return until_reset / (remaining - self.reserve)
+        return 0
+
+    def _pace_write(self, verb, resource):
+        # GraphQL queries are POSTs but read-only; we never send mutations
+        if verb in ("GET", "HEAD") or resource == "graphql" or not self.write_interval:
+            return
+        with self.write_lock:
+            delay = self.last_write + self.write_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.last_write = time.monotonic()
+
+    def _retry_delay(self, request, response, headers, attempt):
+        """Return how long to wait before retrying, or None to give up"""
+        status = response.status
+        if status in (403, 429):
+            body = "" if request["stream"] else (response.read() or "")
+            rate_limited = (
+                status == 429
+                or headers.get("x-ratelimit-remaining") == "0"
+                or "retry-after" in headers
+                or "rate limit" in body.lower()
+                or "abuse" in body.lower()
+            )
+            if not rate_limited:
+                return None  # A genuine permission error
+            if "retry-after" in headers:
+                try:
+                    return float(headers["retry-after"])
+                except ValueError:
+                    pass
+            if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+                return max(float(headers["x-ratelimit-reset"]) - time.time(), 0) + 1
+            # Secondary limit without a hint: back off exponentially
+            return min(60, 5 * 2 ** attempt)
+        if status in RETRYABLE_SERVER_ERRORS and request["verb"] == "GET":
+            return min(30, 2 ** attempt)
+        return None
+
+    def middleware(self, request, send):
+        """Transport middleware that schedules and retries one request"""
+        resource = self.resource_for(request["url"])
+        response = None
+        for attempt in range(self.max_retries + 1):
+            delay = self._quota_delay(resource)
+            if 0 < delay <= self.max_wait:
+                self._sleep(delay)
+            
+            with self.slots:
+                self._pace_write(request["verb"], resource)
+                response = send(request)
+            headers = self._observe(response, resource)
+            
+            delay = self._retry_delay(request, response, headers, attempt)
+            if delay is None or delay > self.max_wait or attempt == self.max_retries:
+                return response
+            with self.lock:
+                self.retries += 1
+            self._sleep(delay)
+        return response
+
+    def _sleep(self, seconds):
+        with self.lock:
+            self.waited += seconds
+        time.sleep(seconds)
+
+_scheduler = None
+
+def get_scheduler():
+    """Return the shared request scheduler, configured from config.json"""
+    global _scheduler
+    if _scheduler is None:
+        config = ConfigManager()
+        _scheduler = RequestScheduler(
+            max_concurrent=config.get("max_concurrent_requests", 8),
+            write_interval=config.get("write_interval", 1.0),
+            reserve=config.get("rate_limit_reserve", 20),
+            max_wait=config.get("max_rate_limit_wait", 900)
+        )
+    return _scheduler
@@ -0,0 +1,368 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from progress import NULL_PROGRESS
+
+SCHEMA_VERSION = "1"
+INDEXED_SUFFIXES = (".java",)
+
+# Relative weight of a term depending on where it occurs
+DECLARATION_WEIGHT = 5.0
+IDENTIFIER_WEIGHT = 1.0
+COMMENT_WEIGHT = 0.5
+PART_FACTOR = 0.5  # camelCase parts count for less than the whole name
+SATURATION = 1.2   # BM25-style k1: repeats help, with diminishing returns
+
+# One pass over the source: comments, string/char literals, identifiers
+TOKEN_RE = re.compile(
+    r'//[^\n]*|/\*.*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[A-Za-z_$][\w$]*',
+    re.S
+)
+WORD_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]+')
+CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+TYPE_RE = re.compile(r'\b(class|interface|enum|record)\s+([A-Za-z_$][\w$]*)')
+METHOD_RE = re.compile(
+    r'^[ \t]*(?:(?:public|protected|private|static|final|abstract|synchronized|native|default|strictfp)\s+)*'
+    r'(?:<[^>\n]+>\s+)?([\w$][\w$<>\[\],.? ]*?)\s+([A-Za-z_$][\w$]*)\s*\([^;{}]*\)\s*'
+    r'(?:throws\s+[\w$.,\s]+)?\{',
+    re.M
+)
+
+JAVA_KEYWORDS = frozenset("""
+    abstract assert boolean break byte case catch char class const continue default do double
+    else enum extends final finally float for goto if implements import instanceof int interface
+    long native new package private protected public return short static strictfp super switch
+    synchronized this throw throws transient try void volatile while var record true false null
+""".split())
+
+def split_identifier(name):
+    """Lower-cased camelCase / snake_case parts of an identifier"""
+    return [part.lower() for part in CAMEL_RE.findall(name)]
+
+def analyze_java(source):
+    """Return ({term: weight}, [(name, kind, line)]) for a Java source file"""
+    terms = {}
+    code = []
+    last = 0
+
+    def add(term, weight):
+        if len(term) > 1:
+            terms[term] = terms.get(term, 0.0) + weight
+
+    def add_identifier(name, weight):
+        add(name.lower(), weight)
+        parts = split_identifier(name)
+        if len(parts) > 1:
+            for part in parts:
+                add(part, weight * PART_FACTOR)
+
+    for match in TOKEN_RE.finditer(source):
+        token = match.group()
+        if token[0] in "/\"'":
+            # Comment or literal: index its words, blank it out for the
+            # declaration scan while keeping line numbers intact
+            for word in WORD_RE.findall(token):
+                add(word.lower(), COMMENT_WEIGHT)
+            code.append(source[last:match.start()])
+            code.append(re.sub(r'[^\n]', ' ', token))
+            last = match.end()
+        elif token not in JAVA_KEYWORDS:
+            add_identifier(token, IDENTIFIER_WEIGHT)
+    code.append(source[last:])
+    code = "".join(code)
+
+    symbols = []
+    for match in TYPE_RE.finditer(code):
+        symbols.append((match.group(2), match.group(1), code.count("\n", 0, match.start()) + 1))
+    for match in METHOD_RE.finditer(code):
+        return_type, name = match.group(1).split()[-1], match.group(2)
+        if name in JAVA_KEYWORDS or return_type in ("new", "return", "else", "throw"):
+            continue
+        symbols.append((name, "method", code.count("\n", 0, match.start(2)) + 1))
+    for name, kind, line in symbols:
+        add_identifier(name, DECLARATION_WEIGHT)
+    return terms, symbols
+
+class SearchIndex:
+    """Persistent inverted index over the Java files in java_files/
+
+    Postings live in SQLite under ~/.codelens/search_index.db, keyed by
+    term, so a query only touches the rows of its own terms. Files are
+    re-analyzed only when their mtime or size changed, and on_event keeps
+    the index current from FileManager's watchdog events.
+    """
+
+    def __init__(self, root="java_files", db_path=None):
+        self.root = Path(root)
+        self.db_path = Path(db_path) if db_path else Path.home() / ".codelens" / "search_index.db"
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self.lock, self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            meta = dict(self.db.execute("SELECT key, value FROM meta"))
+            root = str(self.root.resolve())
+            if meta.get("version") != SCHEMA_VERSION or meta.get("root") != root:
+                # Analyzer changed or a different java_files/: start over
+                for table in ("postings", "symbols", "files"):
+                    self.db.execute(f"DROP TABLE IF EXISTS {table}")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (SCHEMA_VERSION,))
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?)", (root,))
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    file_id INTEGER NOT NULL,
+                    weight REAL NOT NULL,
+                    PRIMARY KEY (term, file_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+                CREATE TABLE IF NOT EXISTS symbols (
+                    file_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    line INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS symbols_file ON symbols (file_id);
+            """)
+
+    def _relative(self, path):
+        """Path relative to the root in posix form, or None if outside it"""
+        try:
+            rel = Path(os.path.abspath(path)).relative_to(os.path.abspath(self.root)).as_posix()
+        except ValueError:
+            return None
+        return None if rel == "." else rel
+
+    @staticmethod
+    def _indexable(rel_path):
+        return rel_path.endswith(INDEXED_SUFFIXES) and not any(
+            part.startswith('.') for part in rel_path.split("/")
+        )
+
+    def _delete(self, file_id):
+        self.db.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _store(self, rel_path, stat):
+        """Analyze one file and replace its rows; caller holds the lock"""
+        row = self.db.execute("SELECT id, mtime_ns, size FROM files WHERE path = ?", (rel_path,)).fetchone()
+        if row and row[1] == stat.st_mtime_ns and row[2] == stat.st_size:
+            return False
+        with open(self.root / rel_path, 'r', encoding='utf-8', errors='replace') as f:
+            terms, symbols = analyze_java(f.read())
+        if row:
+            self.db.execute("DELETE FROM postings WHERE file_id = ?", (row[0],))
+            self.db.execute("DELETE FROM symbols WHERE file_id = ?", (row[0],))
+            self.db.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                            (stat.st_mtime_ns, stat.st_size, row[0]))
+            file_id = row[0]
+        else:
+            file_id = self.db.execute("INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                                      (rel_path, stat.st_mtime_ns, stat.st_size)).lastrowid
+        self.db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                            [(term, file_id, weight) for term, weight in terms.items()])
+        self.db.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?)",
+                            [(file_id, name, kind, line) for name, kind, line in symbols])
+        return True
+
+    def update_file(self, path):
+        """Re-index one file if it changed; drop it if it is gone"""
+        rel_path = self._relative(path)
+        if rel_path is None or not self._indexable(rel_path):
+            return
+        try:
+            stat = os.stat(self.root / rel_path)
+        except OSError:
+            self.remove_file(path)
+            return
+        with self.lock, self.db:
+            self._store(rel_path, stat)
+
+    def remove_file(self, path):
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return
+        with self.lock, self.db:
+            row = self.db.execute("SELECT id FROM files WHERE path = ?", (rel_path,)).fetchone()
+            if row:
+                self._delete(row[0])
+
+    def remove_tree(self, path):
+        """Drop every indexed file below a directory"""
+        rel_path = self._relative(path)
+        with self.lock, self.db:
+            if rel_path is None:
+                rows = self.db.execute("SELECT id FROM files").fetchall()
+            else:
+                # '0' sorts right after '/', bounding the prefix range
+                rows = self.db.execute("SELECT id FROM files WHERE path > ? AND path < ?",
+                                       (rel_path + "/", rel_path + "0")).fetchall()
+            for (file_id,) in rows:
+                self._delete(file_id)
+
+    def refresh(self, path=None, progress=NULL_PROGRESS):
+        """Bring the index in line with disk; returns (updated, removed)
+
+        Unchanged files cost one stat call, so this is cheap to run at
+        startup to pick up edits made while CodeLens was closed.
+        """
+        top = Path(path) if path else self.root
+        prefix = self._relative(top) if path else None
+        seen = []
+        for dirpath, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                rel_path = self._relative(os.path.join(dirpath, name))
+                if rel_path and self._indexable(rel_path):
+                    seen.append(rel_path)
+
+        updated = 0
+        progress.start(len(seen), f"Indexing {len(seen)} files")
+        with self.lock, self.db:
+            for rel_path in seen:
+                try:
+                    if self._store(rel_path, os.stat(self.root / rel_path)):
+                        updated += 1
+                except OSError:
+                    pass
+                progress.advance()
+            if prefix:
+                rows = self.db.execute("SELECT id, path FROM files WHERE path > ? AND path < ?",
+                                       (prefix + "/", prefix + "0")).fetchall()
+            else:
+                rows = self.db.execute("SELECT id, path FROM files").fetchall()
+            seen = set(seen)
+            stale = [file_id for file_id, rel_path in rows if rel_path not in seen]
+            for file_id in stale:
+                self._delete(file_id)
+        progress.finish()
+        return updated, len(stale)
+
+    def on_event(self, event):
+        """FileManager listener that applies watchdog events incrementally"""
+        if event.is_directory:
+            if event.event_type == "deleted":
+                self.remove_tree(event.src_path)
+            elif event.event_type == "moved":
+                self.remove_tree(event.src_path)
+                self.refresh(event.dest_path)
+            elif event.event_type == "created":
+                self.refresh(event.src_path)
+        elif event.event_type in ("created", "modified"):
+            self.update_file(event.src_path)
+        elif event.event_type == "deleted":
+            self.remove_file(event.src_path)
+        elif event.event_type == "moved":
+            self.remove_file(event.src_path)
+            self.update_file(event.dest_path)
+
+    def file_count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _postings(self, term):
+        """[(file_id, weight)] for a term; a trailing * matches a prefix"""
+        if term.endswith("*") and len(term) > 1:
+            stem = term[:-1]
+            rows = self.db.execute(
+                "SELECT file_id, MAX(weight) FROM postings WHERE term >= ? AND term < ? GROUP BY file_id",
+                (stem, stem + "\uffff")
+            ).fetchall()
+        else:
+            rows = self.db.execute("SELECT file_id, weight FROM postings WHERE term = ?", (term,)).fetchall()
+        if not rows and not term.endswith("*"):
+            # "parseHttp" is unknown as a whole; fall back to its parts
+            parts = split_identifier(term)
+            if len(parts) > 1:
+                merged = {}
+                for part in parts:
+                    for file_id, weight in self._postings(part):
+                        merged[file_id] = merged.get(file_id, 0.0) + weight / len(parts)
+                rows = list(merged.items())
+        return rows
+
+    def search(self, query, limit=20):
+        """Rank files for a query
+
+        Returns dicts with path, score, line and the matching symbol (if
+        the best hit is a declaration).
+        """
+        words = re.findall(r'[\w$]+\*?', query)
+        if not words:
+            return []
+        with self.lock:
+            total = self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            scores = {}
+            matched = {}
+            for word in words:
+                rows = self._postings(word.lower())
+                if not rows:
+                    continue
+                idf = math.log(1 + total / len(rows))
+                for file_id, weight in rows:
+                    tf = weight * (SATURATION + 1) / (weight + SATURATION)
+                    scores[file_id] = scores.get(file_id, 0.0) + tf * idf
+                    matched[file_id] = matched.get(file_id, 0) + 1
+            # Files matching every query word come first
+            ranked = sorted(scores, key=lambda fid: (matched[fid], scores[fid]), reverse=True)[:limit]
+
+            results = []
+            for file_id in ranked:
+                path = self.db.execute("SELECT path FROM files WHERE id = ?", (file_id,)).fetchone()[0]
+                symbols = self.db.execute("SELECT name, kind, line FROM symbols WHERE file_id = ? ORDER BY line",
+                                          (file_id,)).fetchall()
+                results.append({
+                    "path": path,
+                    "score": scores[file_id] * matched[file_id] / len(words),
+                    "symbol": None,
+                    "line": None,
+                    "_symbols": symbols
+                })
+
+        stems = [word.lower().rstrip("*") for word in words]
+        for result in results:
+            self._locate(result, stems)
+        return results
+
+    def _locate(self, result, stems):
+        """Fill in the best line to show for a hit"""
+        symbols = result.pop("_symbols")
+        for name, kind, line in symbols:
+            lowered = name.lower()
+            if any(lowered == stem or lowered.startswith(stem) for stem in stems):
+                result["symbol"] = f"{kind} {name}"
+                result["line"] = line
+                return
+        try:
+            with open(self.root / result["path"], 'r', encoding='utf-8', errors='replace') as f:
+                for number, text in enumerate(f, 1):
+                    lowered = text.lower()
+                    if any(stem in lowered for stem in stems):
+                        result["line"] = number
+                        return
+        except OSError:
+            pass
+
+    def line_text(self, rel_path, line):
+        """The stripped source line for a hit, for display"""
+        try:
+            with open(self.root / rel_path, 'r', encoding='utf-8', errors='replace') as f:
+                for number, text in enumerate(f, 1):
+                    if number == line:
+                        return text.strip()
+        except OSError:
+            pass
+        return ""
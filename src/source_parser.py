@@ -0,0 +1,167 @@
+import atexit
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from fs_utils import atomic_write
+
+OUTPUT_MARKER = "// output"
+MAX_PARSE_BYTES = 4 * 1024 * 1024
+TYPE_RE = re.compile(r'\b(?:class|interface|enum|record)\s+([A-Za-z_$][\w$]*)')
+
+def split_sections(lines):
+    """Yield ("code" | "output", line number, text) for each line
+
+    A line starting with "// output" opens an output block and every
+    following "//" line belongs to it; the first other line closes it.
+    Works on any iterable of lines, including an open file, so large
+    files are never held in memory.
+    """
+    in_output = False
+    for number, line in enumerate(lines):
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if stripped.startswith(OUTPUT_MARKER):
+            in_output = True
+            yield "output", number, line.replace(OUTPUT_MARKER, '').strip()
+        elif in_output and stripped.startswith('//'):
+            yield "output", number, line.replace('//', '').strip()
+        else:
+            in_output = False
+            yield "code", number, line
+
+def parse_file(file_path):
+    """Summarize a source file in a single streaming pass"""
+    lines = 0
+    output_lines = 0
+    output_chars = 0
+    classes = []
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for kind, _, text in split_sections(f):
+            lines += 1
+            if kind == "output":
+                output_lines += 1
+                output_chars += len(text)
+            elif not text.lstrip().startswith(("//", "*", "/*")):
+                classes.extend(name for name in TYPE_RE.findall(text) if name not in classes)
+    return {
+        "lines": lines,
+        "has_output": output_lines > 0,
+        "output_lines": output_lines,
+        "output_chars": output_chars,
+        "classes": classes
+    }
+
+class MetadataIndex:
+    """Per-file metadata for java_files/, persisted between runs
+
+    Entries are keyed by path relative to the root and tagged with the
+    mtime and size they were parsed at, so a listing can tell a current
+    entry from a stale one without opening the file. Watchdog events
+    re-parse changed files as they are saved.
+    """
+
+    def __init__(self, root, index_file=None):
+        self.root = os.path.abspath(root)
+        self.index_file = Path(index_file) if index_file else Path.home() / ".codelens" / "file_metadata.json"
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.dirty = False
+        self._load()
+        atexit.register(self.save)
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if data.get("root") == self.root:
+            self.entries = data.get("files", {})
+
+    def save(self):
+        """Write the index if anything changed since the last save"""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps({"root": self.root, "files": self.entries})
+            self.dirty = False
+        try:
+            atomic_write(self.index_file, data)
+        except OSError:
+            pass  # Metadata is rebuilt on demand if it can't be stored
+
+    def _relative(self, path):
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == "." or rel.startswith(".."):
+            return None
+        return rel.replace(os.sep, "/")
+
+    def _parse(self, rel_path):
+        """Parse one file and store its entry; returns the entry or None"""
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            stat = os.stat(full_path)
+            if stat.st_size > MAX_PARSE_BYTES:
+                entry = {"lines": None, "has_output": False, "output_lines": 0, "output_chars": 0, "classes": []}
+            else:
+                entry = parse_file(full_path)
+        except OSError:
+            return None
+        entry["mtime"] = stat.st_mtime
+        entry["size"] = stat.st_size
+        with self.lock:
+            self.entries[rel_path] = entry
+            self.dirty = True
+        return entry
+
+    def get(self, path, mtime=None, size=None):
+        """Metadata for a file, parsing it only if the entry is stale
+
+        Pass the mtime and size already known from the directory index to
+        avoid a stat call for entries that are current.
+        """
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(rel_path)
+        if entry is not None and mtime is not None and entry["mtime"] == mtime and entry["size"] == size:
+            return entry
+        return self._parse(rel_path)
+
+    def _drop(self, rel_path, is_dir):
+        with self.lock:
+            if is_dir:
+                prefix = f"{rel_path}/"
+                for key in [key for key in self.entries if key.startswith(prefix)]:
+                    del self.entries[key]
+            else:
+                self.entries.pop(rel_path, None)
+            self.dirty = True
+
+    def on_event(self, event):
+        """FileManager listener that re-parses files as they change"""
+        rel_path = self._relative(event.src_path)
+        if rel_path is None:
+            return
+        if event.event_type in ("created", "modified"):
+            if not event.is_directory:
+                self._parse(rel_path)
+        elif event.event_type == "deleted":
+            self._drop(rel_path, event.is_directory)
+        elif event.event_type == "moved":
+            dest_path = self._relative(event.dest_path)
+            if event.is_directory:
+                prefix = f"{rel_path}/"
+                with self.lock:
+                    for key in [key for key in self.entries if key.startswith(prefix)]:
+                        if dest_path is not None:
+                            self.entries[f"{dest_path}/{key[len(prefix):]}"] = self.entries[key]
+                        del self.entries[key]
+                    self.dirty = True
+            else:
+                self._drop(rel_path, False)
+                if dest_path is not None:
+                    self._parse(dest_path)
@@ -0,0 +1,71 @@
+import importlib
+import sys
+import time
+from rich import box
+from rich.table import Table
+
+# Modules the CLI defers until a command needs them
+DEFERRED_MODULES = [
+    ("questionary", "Interactive prompts"),
+    ("github", "PyGithub"),
+    ("watchdog.observers", "File watching"),
+    ("pygments", "Syntax highlighting"),
+    ("pyfiglet", "ASCII banners"),
+    ("github_sync", "GitHub sync layer"),
+    ("file_manager", "Local file browser"),
+]
+
+def _timed(action):
+    started = time.perf_counter()
+    try:
+        action()
+        error = None
+    except Exception as e:
+        error = str(e)
+    return (time.perf_counter() - started) * 1000, error
+
+def profile_startup(started_at, ready_at, console):
+    """Report time-to-prompt and what each deferred subsystem would cost
+
+    ready_at is taken once the first menu is drawn, just before input().
+    """
+    time_to_prompt = (ready_at - started_at) * 1000
+    
+    table = Table(
+        title="[bold]Startup Profile[/bold]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+        title_style="bold cyan"
+    )
+    table.add_column("Component", style="bold green")
+    table.add_column("Kind", style="white")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Loaded", style="yellow")
+    
+    table.add_row("Time to prompt", "startup", f"{time_to_prompt:.1f}", "-")
+    
+    for module_name, description in DEFERRED_MODULES:
+        if module_name in sys.modules:
+            table.add_row(f"{description} ({module_name})", "import", "0.0", "at startup")
+            continue
+        elapsed, error = _timed(lambda: importlib.import_module(module_name))
+        table.add_row(
+            f"{description} ({module_name})",
+            "import",
+            f"{elapsed:.1f}",
+            f"[red]failed: {error}[/red]" if error else "on first use"
+        )
+    
+    def init_file_manager():
+        from file_manager import FileManager
+        FileManager().observer.stop()
+    
+    def init_github_sync():
+        from github_sync import GitHubSync
+        GitHubSync()
+    
+    for label, action in (("FileManager()", init_file_manager), ("GitHubSync()", init_github_sync)):
+        elapsed, error = _timed(action)
+        table.add_row(label, "init", f"{elapsed:.1f}", f"[red]failed: {error}[/red]" if error else "on first use")
+    
+    console.print(table)
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+from pathlib import Path
+from fs_utils import atomic_write, file_blob_sha
+from progress import NULL_PROGRESS
+
+# Sync may run as a background job; saves of different repos must not interleave
+_state_lock = threading.Lock()
+
+class SyncEngine:
+    """Incremental two-way sync between java_files/ and the personal repo.
+
+    Files are compared by git blob SHA against the state recorded at the
+    last successful sync, so only paths that changed on either side cost
+    a network round trip. Only files inside a category directory are
+    synced; top-level files such as the repo README are left alone.
+    """
+
+    def __init__(self, github_sync, local_root="java_files"):
+        self.github_sync = github_sync
+        self.local_root = Path(local_root)
+        self.state_file = Path.home() / ".codelens" / "sync_state.json"
+
+    def load_state(self, repo_name):
+        """Load the last synced state for a repository"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f).get(repo_name, {"base": {}, "local": {}})
+            except Exception:
+                pass
+        return {"base": {}, "local": {}}
+
+    def save_state(self, repo_name, state):
+        """Persist the synced state for a repository"""
+        with _state_lock:
+            all_states = {}
+            if self.state_file.exists():
+                try:
+                    with open(self.state_file, 'r') as f:
+                        all_states = json.load(f)
+                except Exception:
+                    all_states = {}
+            all_states[repo_name] = state
+            atomic_write(self.state_file, json.dumps(all_states))
+
+    def scan_local(self, state):
+        """Map relative paths to blob SHAs, rehashing only touched files"""
+        known = state.get("local", {})
+        scanned = {}
+        local = {}
+        for root, dirs, files in os.walk(self.local_root):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                if name.startswith('.'):
+                    continue
+                full_path = os.path.join(root, name)
+                rel_path = Path(full_path).relative_to(self.local_root).as_posix()
+                if "/" not in rel_path:
+                    continue
+                stat = os.stat(full_path)
+                cached = known.get(rel_path)
+                if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    sha = cached[2]
+                else:
+                    sha = file_blob_sha(full_path)
+                scanned[rel_path] = [stat.st_mtime_ns, stat.st_size, sha]
+                local[rel_path] = sha
+        state["local"] = scanned
+        return local
+
+    def scan_remote(self, repo, progress=NULL_PROGRESS):
+        """Map repository paths to blob SHAs with a single tree request"""
+        return {
+            entry["path"]: entry["sha"]
+            for entry in self.github_sync.get_remote_manifest(repo, progress=progress)
+            if entry["type"] == "file" and "/" in entry["path"]
+        }
+
+    def plan(self, local, remote, base):
+        """Decide what has to move in each direction"""
+        plan = {
+            "upload": [],
+            "download": [],
+            "delete_local": [],
+            "delete_remote": [],
+            "conflicts": []
+        }
+        for path in sorted(set(local) | set(remote) | set(base)):
+            local_sha = local.get(path)
+            remote_sha = remote.get(path)
+            base_sha = base.get(path)
+
+            if local_sha == remote_sha:
+                continue
+            if remote_sha == base_sha:
+                # Only the local copy changed since the last sync
+                if local_sha is None:
+                    plan["delete_remote"].append(path)
+                else:
+                    plan["upload"].append(path)
+            elif local_sha == base_sha:
+                # Only the remote copy changed since the last sync
+                if remote_sha is None:
+                    plan["delete_local"].append(path)
+                else:
+                    plan["download"].append(path)
+            else:
+                plan["conflicts"].append(path)
+        return plan
+
+    def prepare(self, progress=NULL_PROGRESS):
+        """Scan both sides and return (repo, state, local, remote, plan)"""
+        progress.update("Resolving repository")
+        repo = self.github_sync.setup_repo()
+        if not repo:
+            return None
+        state = self.load_state(repo.full_name)
+        progress.update("Scanning local files")
+        local = self.scan_local(state)
+        progress.update("Listing remote files")
+        remote = self.scan_remote(repo, progress)
+        plan = self.plan(local, remote, state.get("base", {}))
+        return repo, state, local, remote, plan
+
+    def apply(self, repo, state, local, remote, plan, progress=NULL_PROGRESS):
+        """Apply a sync plan and record the new base state"""
+        base = dict(state.get("base", {}))
+        # Paths already identical on both sides become part of the base
+        for path, sha in local.items():
+            if remote.get(path) == sha:
+                base[path] = sha
+        errors = []
+
+        # Local changes travel as a single commit
+        if plan["upload"] or plan["delete_remote"]:
+            try:
+                contents = {}
+                for path in plan["upload"]:
+                    with open(self.local_root / path, 'rb') as f:
+                        contents[path] = f.read()
+                progress.update(f"Uploading {len(contents)} files")
+                self.github_sync.commit_files(
+                    repo,
+                    contents,
+                    f"Sync {len(contents)} changed and {len(plan['delete_remote'])} removed files via CodeLens",
+                    deletions=plan["delete_remote"],
+                    progress=progress
+                )
+                for path in plan["upload"]:
+                    base[path] = local[path]
+                for path in plan["delete_remote"]:
+                    base.pop(path, None)
+            except Exception as e:
+                errors.extend((path, str(e)) for path in plan["upload"] + plan["delete_remote"])
+
+        if plan["download"]:
+            items = [
+                {"remote_path": path, "local_path": self.local_root / path, "sha": remote[path]}
+                for path in plan["download"]
+            ]
+            for result in self.github_sync.download_files(items, repo=repo, progress=progress):
+                path = result["item"]["remote_path"]
+                if result["ok"]:
+                    base[path] = remote[path]
+                else:
+                    errors.append((path, result["error"]))
+
+        for path in plan["delete_local"]:
+            try:
+                (self.local_root / path).unlink(missing_ok=True)
+                base.pop(path, None)
+            except Exception as e:
+                errors.append((path, str(e)))
+
+        # Paths gone from both sides must not linger as a stale base
+        state["base"] = {path: sha for path, sha in base.items() if path in local or path in remote}
+        # Rescan so freshly written files don't get rehashed next time
+        self.scan_local(state)
+        self.save_state(repo.full_name, state)
+        return errors
@@ -2,7 +2,6 @@ from rich.console import Console
 from rich.text import Text
 import os
 import getpass
-import pyfiglet
 
 class BaseScreen:
     def __init__(self):
@@ -24,5 +23,6 @@ class BaseScreen:
         self.console.print(prompt)
     
     def ascii_banner(self, text, font="slant", color="cyan"):
+        import pyfiglet
         ascii_art = pyfiglet.figlet_format(text, font=font)
         self.console.print(Text(ascii_art, style=color))
\ No newline at end of file
@@ -0,0 +1,285 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from api_metrics import get_metrics
+from config_manager import ConfigManager
+from progress import ProgressReporter
+
+PERSONAL = ""  # repo column value for the personal repository
+DEFAULT_BATCH_SIZE = 100
+IDLE_INTERVAL = 30      # seconds between checks when nothing is due
+MAX_RETRY_DELAY = 300
+MAX_ATTEMPTS = 10       # transient failures before an entry is marked failed
+# Responses that mean the request itself is wrong. 409/422 are not here:
+# GitHub answers a stale SHA or a non-fast-forward ref update with them,
+# and the next attempt re-reads the branch.
+PERMANENT_STATUSES = (400, 404, 410, 413, 415)
+METRICS_LABEL = "upload-queue"  # API stats entry for the flusher's requests
+# The flusher has no console to print to; its failures are kept in the queue
+QUIET = ProgressReporter()
+
+class UploadQueue:
+    """Durable journal of pending uploads, pushed by a background flusher
+
+    Uploads are recorded in SQLite under ~/.codelens/upload_queue.db and
+    the caller returns at once. A daemon thread pushes due entries in
+    batches, one commit per repository and category, and deletes them
+    only after the commit landed. Pushes skip files whose blob SHA the
+    repository already has, so replaying a batch after a crash or a lost
+    response is harmless. Transient failures are retried with exponential
+    backoff; an entry that can never succeed (unreadable file, request
+    GitHub rejects) or keeps failing is marked failed and left for the
+    'queue' command, so it doesn't hold back the rest of its batch.
+    """
+
+    def __init__(self, db_path=None, batch_size=None):
+        self.db_path = Path(db_path) if db_path else Path.home() / ".codelens" / "upload_queue.db"
+        self.db_path.parent.mkdir(exist_ok=True)
+        if batch_size is None:
+            batch_size = ConfigManager().get("upload_batch_size", DEFAULT_BATCH_SIZE)
+        self.batch_size = max(1, int(batch_size))
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.wake = threading.Event()
+        self.thread = None
+        self.github_sync = None
+        self.pushed = 0
+        self._init_schema()
+
+    def _init_schema(self):
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    id INTEGER PRIMARY KEY,
+                    repo TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    local_path TEXT NOT NULL,
+                    revision INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    UNIQUE (repo, category, name)
+                )
+            """)
+            columns = [row[1] for row in self.db.execute("PRAGMA table_info(uploads)")]
+            if "failed" not in columns:  # Queues written before failed entries were kept
+                self.db.execute("ALTER TABLE uploads ADD COLUMN failed INTEGER NOT NULL DEFAULT 0")
+
+    def enqueue(self, files, category, repo=PERSONAL):
+        """Record (local_path, relative_name) pairs for upload
+
+        repo is the community repository's full name, or PERSONAL.
+        Queuing a file that is already pending replaces that entry.
+        """
+        revision = time.time_ns()
+        rows = [(repo, category, name, os.path.abspath(path), revision) for path, name in files]
+        with self.lock, self.db:
+            self.db.executemany("""
+                INSERT INTO uploads (repo, category, name, local_path, revision)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (repo, category, name) DO UPDATE SET
+                    local_path = excluded.local_path, revision = excluded.revision,
+                    attempts = 0, next_attempt = 0, last_error = NULL, failed = 0
+            """, rows)
+        self.wake.set()
+        return len(rows)
+
+    def counts(self):
+        """(pending, retrying, failed) entry counts"""
+        with self.lock:
+            return self.db.execute("""
+                SELECT COALESCE(SUM(failed = 0), 0), COALESCE(SUM(failed = 0 AND attempts > 0), 0),
+                       COALESCE(SUM(failed), 0)
+                FROM uploads
+            """).fetchone()
+
+    def last_error(self):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT last_error FROM uploads WHERE last_error IS NOT NULL AND failed = 0 "
+                "ORDER BY next_attempt DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def entries(self):
+        """(id, repo, category, name, attempts, failed, last_error) for every entry"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT id, repo, category, name, attempts, failed, last_error FROM uploads ORDER BY failed DESC, id"
+            ).fetchall()
+
+    def drop_failed(self):
+        """Forget failed entries; returns how many were dropped"""
+        with self.lock, self.db:
+            return self.db.execute("DELETE FROM uploads WHERE failed = 1").rowcount
+
+    def retry_failed(self):
+        """Queue failed entries again; returns how many"""
+        with self.lock, self.db:
+            count = self.db.execute(
+                "UPDATE uploads SET failed = 0, attempts = 0, next_attempt = 0 WHERE failed = 1"
+            ).rowcount
+        self.wake.set()
+        return count
+
+    def next_batch(self, now=None):
+        """(repo, category, rows) for the oldest due entry's group, or None"""
+        now = time.time() if now is None else now
+        with self.lock:
+            first = self.db.execute(
+                "SELECT repo, category FROM uploads WHERE failed = 0 AND next_attempt <= ? ORDER BY id LIMIT 1", (now,)
+            ).fetchone()
+            if first is None:
+                return None
+            rows = self.db.execute("""
+                SELECT id, name, local_path, revision, attempts FROM uploads
+                WHERE repo = ? AND category = ? AND failed = 0 AND next_attempt <= ?
+                ORDER BY id LIMIT ?
+            """, (*first, now, self.batch_size)).fetchall()
+        return first[0], first[1], rows
+
+    def _finish(self, rows):
+        # An entry re-queued while its push was in flight stays queued
+        with self.lock, self.db:
+            self.db.executemany(
+                "DELETE FROM uploads WHERE id = ? AND revision = ?",
+                [(row[0], row[3]) for row in rows]
+            )
+
+    def _retry_later(self, rows, error, count_attempt=True, permanent=False):
+        now = time.time()
+        with self.lock, self.db:
+            for row_id, _, _, revision, attempts in rows:
+                attempts += 1 if count_attempt else 0
+                delay = min(MAX_RETRY_DELAY, 5 * 2 ** attempts) if count_attempt else IDLE_INTERVAL
+                failed = permanent or attempts >= MAX_ATTEMPTS
+                self.db.execute(
+                    "UPDATE uploads SET attempts = ?, next_attempt = ?, last_error = ?, failed = ? "
+                    "WHERE id = ? AND revision = ?",
+                    (attempts, now + delay, error, int(failed), row_id, revision)
+                )
+
+    def _repo_handle(self, github_sync, repo):
+        if repo == PERSONAL:
+            return github_sync.setup_repo()
+        # Resolved by name, so a flush never prompts like setup_community_repo
+        return github_sync.session.get_repo(repo)
+
+    def flush_once(self, github_sync):
+        """Push one due batch; True if something was pushed"""
+        batch = self.next_batch()
+        if batch is None:
+            return False
+        repo, category, rows = batch
+
+        # A file deleted since it was queued has nothing left to upload
+        missing = [row for row in rows if not os.path.isfile(row[2])]
+        if missing:
+            self._finish(missing)
+            rows = [row for row in rows if row not in missing]
+            if not rows:
+                return True
+
+        if not github_sync.client:
+            self._retry_later(rows, "Not authenticated - run 'auth'", count_attempt=False)
+            return False
+        try:
+            handle = self._repo_handle(github_sync, repo)
+            if handle is None:
+                raise RuntimeError("repository is not available")
+        except Exception as e:
+            self._retry_later(rows, str(e), permanent=is_permanent(e))
+            return False
+        try:
+            self._push(github_sync, handle, repo, category, rows)
+        except Exception as e:
+            if not is_permanent(e) or len(rows) == 1:
+                self._retry_later(rows, str(e), permanent=is_permanent(e))
+                return False
+            # Some entry can never be pushed; find it so the others still go
+            return self._push_each(github_sync, handle, repo, category, rows)
+        return True
+
+    def _push(self, github_sync, handle, repo, category, rows):
+        files = [(local_path, name) for _, name, local_path, _, _ in rows]
+        if repo == PERSONAL:
+            github_sync.push_files(handle, files, category, QUIET)
+        else:
+            github_sync.push_community_files(handle, files, category, QUIET)
+        self._finish(rows)
+        self.pushed += len(rows)
+
+    def _push_each(self, github_sync, handle, repo, category, rows):
+        pushed = False
+        for index, row in enumerate(rows):
+            try:
+                self._push(github_sync, handle, repo, category, [row])
+                pushed = True
+            except Exception as e:
+                if not is_permanent(e):
+                    self._retry_later(rows[index:], str(e))
+                    break
+                self._retry_later([row], str(e), permanent=True)
+        return pushed
+
+    def _idle_delay(self):
+        with self.lock:
+            row = self.db.execute("SELECT MIN(next_attempt) FROM uploads WHERE failed = 0").fetchone()
+        if row[0] is None:
+            return IDLE_INTERVAL
+        return min(IDLE_INTERVAL, max(0.0, row[0] - time.time()))
+
+    def _run(self):
+        with get_metrics().attribute(METRICS_LABEL):
+            self._flush_forever()
+
+    def _flush_forever(self):
+        while True:
+            self.wake.clear()
+            try:
+                while self.flush_once(self.github_sync):
+                    pass
+                delay = self._idle_delay()
+            except Exception:
+                delay = IDLE_INTERVAL  # Keep the flusher alive; entries stay queued
+            self.wake.wait(delay)
+
+    def start(self, github_sync):
+        """Start the background flusher (once per process)"""
+        self.github_sync = github_sync
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="upload-flusher", daemon=True)
+            self.thread.start()
+        self.wake.set()
+
+def is_permanent(error):
+    """True if pushing again can't help: the file or the request itself is bad"""
+    # Imported here: the header reads the queue before PyGithub is needed
+    from github import GithubException
+    from requests import RequestException
+    if isinstance(error, GithubException):
+        return error.status in PERMANENT_STATUSES
+    if isinstance(error, (RequestException, ConnectionError, TimeoutError)):
+        return False  # Network trouble, though these are OSErrors too
+    return isinstance(error, (UnicodeError, OSError))
+
+def pending_uploads():
+    """(pending, retrying, failed) counts without opening a queue that doesn't exist"""
+    if _upload_queue is not None:
+        return _upload_queue.counts()
+    if not (Path.home() / ".codelens" / "upload_queue.db").exists():
+        return 0, 0, 0
+    return get_upload_queue().counts()
+
+_upload_queue = None
+
+def get_upload_queue():
+    """Process-wide upload queue"""
+    global _upload_queue
+    if _upload_queue is None:
+        _upload_queue = UploadQueue()
+    return _upload_queue
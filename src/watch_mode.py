@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from rich.console import Console
+from config_manager import ConfigManager
+from fs_utils import git_blob_sha
+
+console = Console()
+
+DEFAULT_DEBOUNCE = 3.0  # seconds of quiet before a batch is pushed
+
+# Editor swap, backup and partial-write files that should never be pushed
+TEMP_SUFFIXES = (".swp", ".swo", ".swx", ".tmp", ".temp", ".bak", ".part", ".crdownload", "~")
+TEMP_PREFIXES = (".", "~$", "#")
+TEMP_NAMES = ("4913",)  # Vim's write-permission probe
+
+def is_temp_file(path):
+    """True for editor temp/swap files and hidden files"""
+    name = os.path.basename(path)
+    return (
+        name.endswith(TEMP_SUFFIXES)
+        or name.startswith(TEMP_PREFIXES)
+        or name in TEMP_NAMES
+    )
+
+class ChangeCollector:
+    """Coalesce watchdog events into per-path change sets
+
+    Each path keeps only its latest state ("upsert" or "delete"), so the
+    burst of events an editor fires on save collapses to one entry. A
+    batch is released once no event has arrived for the debounce window.
+    """
+
+    def __init__(self, root, debounce=DEFAULT_DEBOUNCE):
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.last_event = 0.0
+
+    def _relative(self, path):
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel.startswith("..") or rel == ".":
+            return None
+        rel = rel.replace(os.sep, "/")
+        if any(part.startswith('.') for part in rel.split("/")):
+            return None
+        return rel
+
+    def _record(self, path, change):
+        if is_temp_file(path):
+            return
+        rel = self._relative(path)
+        # Only files inside a category are pushed, as with sync; a whole
+        # category can still be removed
+        if rel is None or ("/" not in rel and change != "delete_dir"):
+            return
+        with self.lock:
+            self.pending[rel] = change
+            self.last_event = time.monotonic()
+
+    def on_event(self, event):
+        if event.is_directory:
+            if event.event_type == "deleted":
+                self._record(event.src_path, "delete_dir")
+            return
+        if event.event_type in ("created", "modified"):
+            self._record(event.src_path, "upsert")
+        elif event.event_type == "deleted":
+            self._record(event.src_path, "delete")
+        elif event.event_type == "moved":
+            self._record(event.src_path, "delete")
+            self._record(event.dest_path, "upsert")
+
+    def take_batch(self):
+        """Return the pending changes once the quiet period has passed"""
+        with self.lock:
+            if not self.pending or time.monotonic() - self.last_event < self.debounce:
+                return None
+            batch, self.pending = self.pending, {}
+            return batch
+
+class WatchMode:
+    """Push saved files to the personal repo as coalesced commits"""
+
+    def __init__(self, file_manager, github_sync, debounce=None):
+        if debounce is None:
+            debounce = float(ConfigManager().get("watch_debounce", DEFAULT_DEBOUNCE))
+        self.file_manager = file_manager
+        self.github_sync = github_sync
+        self.collector = ChangeCollector(file_manager.base_path, debounce)
+        self.commits = 0
+        self.files_pushed = 0
+
+    def build_commit(self, batch, manifest):
+        """Turn a change set into (contents, deletions), dropping no-ops"""
+        remote = {entry["path"]: entry["sha"] for entry in manifest if entry["type"] == "file"}
+        contents = {}
+        deletions = []
+        for rel_path, change in sorted(batch.items()):
+            local_path = os.path.join(self.collector.root, rel_path)
+            if change == "delete_dir":
+                prefix = f"{rel_path}/"
+                deletions.extend(path for path in remote if path.startswith(prefix) and path not in contents)
+            elif change == "upsert" and os.path.isfile(local_path):
+                try:
+                    with open(local_path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                if remote.get(rel_path) != git_blob_sha(data):
+                    contents[rel_path] = data
+            elif rel_path in remote:
+                deletions.append(rel_path)
+        return contents, sorted(set(deletions))
+
+    def flush(self, batch):
+        """Push one batch as a single commit; returns the files changed"""
+        repo = self.github_sync.setup_repo()
+        if not repo:
+            raise RuntimeError("Could not access your personal repository")
+        manifest = self.github_sync.get_remote_manifest(repo)
+        contents, deletions = self.build_commit(batch, manifest)
+        if not contents and not deletions:
+            return [], []
+        
+        names = sorted(contents) + deletions
+        summary = ", ".join(os.path.basename(name) for name in names[:3])
+        if len(names) > 3:
+            summary += f" and {len(names) - 3} more"
+        self.github_sync.commit_files(repo, contents, f"Auto-save {summary} via CodeLens watch", deletions=deletions)
+        self.commits += 1
+        self.files_pushed += len(names)
+        return sorted(contents), deletions
+
+    def run(self, poll_interval=0.25):
+        """Watch until interrupted with Ctrl+C"""
+        self.file_manager.add_listener(self.collector.on_event)
+        try:
+            while True:
+                time.sleep(poll_interval)
+                batch = self.collector.take_batch()
+                if not batch:
+                    continue
+                try:
+                    uploaded, deleted = self.flush(batch)
+                except Exception as e:
+                    # Keep the changes so the next quiet period retries them
+                    with self.collector.lock:
+                        for path, change in batch.items():
+                            self.collector.pending.setdefault(path, change)
+                        self.collector.last_event = time.monotonic()
+                    console.print(f"[red]Push failed, will retry: {e}[/red]")
+                    continue
+                stamp = time.strftime("%H:%M:%S")
+                for path in uploaded:
+                    console.print(f"[green]{stamp} pushed {path}[/green]")
+                for path in deleted:
+                    console.print(f"[yellow]{stamp} removed {path}[/yellow]")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.file_manager.remove_listener(self.collector.on_event)
@@ -0,0 +1,52 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import api_metrics
+from api_metrics import ApiMetrics, NO_COMMAND
+from download_executor import submit
+from jobs import JobManager
+
+
+def use_metrics(monkeypatch):
+    metrics = ApiMetrics()
+    monkeypatch.setattr(api_metrics, "_metrics", metrics)
+    return metrics
+
+
+def test_job_request_counts_against_its_command_after_it_exited(monkeypatch):
+    metrics = use_metrics(monkeypatch)
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def work(progress):
+        release.wait(5)
+        metrics.record(200, 12.0, received=100)
+
+    with metrics.command("fetch --all"):
+        job = manager.submit("Fetch", work)
+    # The job's request arrives while another command is in the foreground
+    with metrics.command("browse"):
+        metrics.record(200, 5.0)
+        release.set()
+        job.future.result(timeout=5)
+
+    assert job.status == "done"
+    assert metrics.commands["fetch --all"].requests == 1
+    assert metrics.commands["fetch --all"].bytes_received == 100
+    assert metrics.commands["browse"].requests == 1
+
+
+def test_attribution_follows_work_into_worker_pools(monkeypatch):
+    metrics = use_metrics(monkeypatch)
+    with metrics.attribute("upload-queue"):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for future in [submit(pool, metrics.record, 200, 1.0) for _ in range(3)]:
+                future.result()
+    metrics.record(200, 1.0)
+
+    assert metrics.commands["upload-queue"].requests == 3
+    assert metrics.commands[NO_COMMAND].requests == 1
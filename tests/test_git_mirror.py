@@ -0,0 +1,122 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+pytest.importorskip("git")
+if shutil.which("git") is None:
+    pytest.skip("git is not installed", allow_module_level=True)
+
+from fs_utils import git_blob_sha
+from git_mirror import GitMirror
+
+AUTHOR_ENV = {
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def run_git(*args, cwd):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True, env=AUTHOR_ENV
+    ).stdout.strip()
+
+
+def push_files(remote, workdir, files, message):
+    """Commit files {path: text} to the remote's main branch from a working clone"""
+    if not workdir.exists():
+        run_git("clone", "--quiet", str(remote), str(workdir), cwd=remote.parent)
+        run_git("checkout", "--quiet", "-B", "main", cwd=workdir)
+    else:
+        run_git("pull", "--quiet", "origin", "main", cwd=workdir)
+    for path, text in files.items():
+        target = workdir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text)
+    run_git("add", "--all", cwd=workdir)
+    run_git("commit", "--quiet", "-m", message, cwd=workdir)
+    run_git("push", "--quiet", "origin", "main", cwd=workdir)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Bare repository served over file:// with partial clone enabled"""
+    path = tmp_path / "remote.git"
+    run_git("init", "--quiet", "--bare", "--initial-branch=main", str(path), cwd=tmp_path)
+    run_git("config", "uploadpack.allowFilter", "true", cwd=path)
+    run_git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=path)
+    push_files(path, tmp_path / "work", {
+        "loops/For.java": "class For {}\n",
+        "loops/nested/While.java": "class While {}\n",
+    }, "Initial commit")
+    return path
+
+
+@pytest.fixture
+def mirror(tmp_path, remote):
+    return GitMirror(remote.as_uri(), "student/java", mirror_root=tmp_path / "mirror")
+
+
+def files_of(manifest):
+    return {entry["path"]: entry["sha"] for entry in manifest if entry["type"] == "file"}
+
+
+def test_clone_lists_manifest_without_blobs(mirror):
+    files = files_of(mirror.manifest())
+
+    assert (mirror.path / "HEAD").exists()
+    assert mirror.default_branch() == "main"
+    assert files == {
+        "loops/For.java": git_blob_sha(b"class For {}\n"),
+        "loops/nested/While.java": git_blob_sha(b"class While {}\n"),
+    }
+    assert {"loops", "loops/nested"} <= {entry["path"] for entry in mirror.manifest() if entry["type"] == "dir"}
+    # Partial clone: the blobs have not been downloaded yet
+    assert mirror.missing(files.values()) == set(files.values())
+
+
+def test_prefetch_and_read_blobs(mirror):
+    sha = files_of(mirror.manifest())["loops/For.java"]
+
+    assert mirror.prefetch([sha]) == 1
+    assert mirror.missing([sha]) == set()
+    assert mirror.read(sha) == b"class For {}\n"
+
+
+def test_fetch_picks_up_remote_commits(tmp_path, remote, mirror):
+    mirror.manifest()  # Clone before the remote moves
+    push_files(remote, tmp_path / "work", {"arrays/Sum.java": "class Sum {}\n"}, "Add arrays")
+
+    mirror.fetch()
+
+    assert files_of(mirror.manifest())["arrays/Sum.java"] == git_blob_sha(b"class Sum {}\n")
+    assert mirror.head() == run_git("rev-parse", "main", cwd=remote)
+
+
+def test_commit_and_push(remote, mirror):
+    commit = mirror.commit_and_push(
+        {"loops/Do.java": b"class Do {}\n"}, "Add Do", deletions=["loops/For.java"],
+        author=("student", "student@users.noreply.github.com")
+    )
+
+    assert run_git("rev-parse", "main", cwd=remote) == commit
+    assert run_git("ls-tree", "-r", "--name-only", "main", cwd=remote).split("\n") == [
+        "loops/Do.java", "loops/nested/While.java"
+    ]
+    assert run_git("show", "main:loops/Do.java", cwd=remote) == "class Do {}"
+    assert run_git("log", "-1", "--format=%an %s", "main", cwd=remote) == "student Add Do"
+
+
+def test_commit_and_push_builds_on_commits_made_since_the_clone(tmp_path, remote, mirror):
+    mirror.manifest()
+    push_files(remote, tmp_path / "work", {"arrays/Sum.java": "class Sum {}\n"}, "Someone else's commit")
+
+    mirror.commit_and_push({"loops/Do.java": b"class Do {}\n"}, "Add Do")
+
+    assert run_git("ls-tree", "-r", "--name-only", "main", cwd=remote).split("\n") == [
+        "arrays/Sum.java", "loops/Do.java", "loops/For.java", "loops/nested/While.java"
+    ]